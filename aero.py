@@ -1,54 +1,71 @@
-from typing import Optional
+from typing import BinaryIO, List, Optional
 
+import numpy as np
 
 from grid import BladeGrid
 from io_blade import AeroData
+from io_utils import write_parts
 
+# Per-node aerodynamic reference frame (node index thrice)
+_AERO_REF_TMPL = (
+    "reference: CURR_ROTOR + CURR_blade + AERO + %d, #gen ref\n"
+    "    reference, CURR_ROTOR + CURR_blade + FEATH + %d, 0., 0., 0.,\n"
+    "    reference, CURR_ROTOR + CURR_blade + FEATH + %d, eye,\n"
+    "    reference, CURR_ROTOR + BASE, null,\n"
+    "    reference, CURR_ROTOR + BASE, null;\n\n"
+)
 
-def write_aero_refs_file(grid: BladeGrid, name: str, out_path: str) -> None:
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("# blade_aero.ref\n")
-        f.write(f"# name={name}\n")
-        for i, _x in enumerate(grid.nodes, start=1):
-            f.write(f"reference: CURR_ROTOR + CURR_blade + AERO + {i}, #gen ref\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, 0., 0., 0.,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, eye,\n")
-            f.write("    reference, CURR_ROTOR + BASE, null,\n")
-            f.write("    reference, CURR_ROTOR + BASE, null;\n\n")
+# Invariant lines repeated in every aerodynamic beam3 element
+_IV = "    induced velocity, CURR_ROTOR,\n"
+_ORI = "        1, 0., 1., 0., 3, 1., 0., 0.,\n"
+_AERO_NODE_TMPL = "    reference, CURR_ROTOR + CURR_blade + AERO + %d, null,\n" + _ORI
+_PWL3_TMPL = (
+    "    piecewise linear, 3,\n"
+    "        -1.0000000000, %.10f,\n"
+    "         0.0000000000, %.10f,\n"
+    "         1.0000000000, %.10f,\n"
+    "    const, 0.,\n"
+)
 
+# Per-element block of blade.aerobeam; only indices and chord values vary
+_AERO_ELEM_TMPL = (
+    "# element %d: x1=%.10f xm=%.10f x2=%.10f\n"
+    "aerodynamic beam3:\n"
+    "    CURR_ROTOR + CURR_blade + %d,\n"
+    "    CURR_ROTOR + CURR_blade + %d,\n"
+    + _IV
+    + _AERO_NODE_TMPL * 3
+    + _PWL3_TMPL * 2
+    + "\n"
+)
 
-def write_aero_beam_file(aero: Optional[AeroData], grid: BladeGrid, name: str, out_path: str) -> None:
+
+def write_aero_refs_file(grid: BladeGrid, name: str, out_path: str, *, out: Optional[BinaryIO] = None) -> None:
+    parts: List[str] = ["# blade_aero.ref\n", f"# name={name}\n"]
+    parts += [_AERO_REF_TMPL % (i, i, i) for i in range(1, len(grid.nodes) + 1)]
+    write_parts(parts, out_path, out)
+
+
+def write_aero_beam_file(
+    aero: Optional[AeroData], grid: BladeGrid, name: str, out_path: str, *, out: Optional[BinaryIO] = None
+) -> None:
     if aero is None:
         return
-    if grid.interp_aero is None:
+    if grid.interp_aero_vec is None:
         raise RuntimeError("attach_interpolators() first.")
 
-    def _f(x: float) -> str:
-        return f"{x:.10f}"
-
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("# blade.aerobeam\n")
-        f.write(f"# name={name}\n")
-        for eidx, (x1, xm, x2) in enumerate(grid.elements, start=1):
-            n1, n2, n3 = 2 * eidx - 1, 2 * eidx, 2 * eidx + 1
-            c1 = grid.interp_aero("Chord", x1)
-            cm = grid.interp_aero("Chord", xm)
-            c2 = grid.interp_aero("Chord", x2)
-            f.write(f"# element {eidx}: x1={_f(x1)} xm={_f(xm)} x2={_f(x2)}\n")
-            f.write("aerodynamic beam3:\n")
-            f.write(f"    CURR_ROTOR + CURR_blade + {eidx},\n")
-            f.write(f"    CURR_ROTOR + CURR_blade + {eidx},\n")
-            f.write("    induced velocity, CURR_ROTOR,\n")
-            for nid in (n1, n2, n3):
-                f.write(f"    reference, CURR_ROTOR + CURR_blade + AERO + {nid}, null,\n")
-                f.write("        1, 0., 1., 0., 3, 1., 0., 0.,\n")
-            f.write("    piecewise linear, 3,\n")
-            f.write(f"        -1.0000000000, {_f(c1)},\n")
-            f.write(f"         0.0000000000, {_f(cm)},\n")
-            f.write(f"         1.0000000000, {_f(c2)},\n")
-            f.write("    const, 0.,\n")
-            f.write("    piecewise linear, 3,\n")
-            f.write(f"        -1.0000000000, {_f(-0.5 * c1)},\n")
-            f.write(f"         0.0000000000, {_f(-0.5 * cm)},\n")
-            f.write(f"         1.0000000000, {_f(-0.5 * c2)},\n")
-            f.write("    const, 0.,\n\n")
+    # Chord at (x1, xm, x2) of every element in one batched call
+    xs = np.stack([grid.elem_x1, grid.elem_xm, grid.elem_x2], axis=1).ravel()
+    chords = grid.interp_aero_vec("Chord", xs).reshape(-1, 3).tolist()
+
+    parts: List[str] = ["# blade.aerobeam\n", f"# name={name}\n"]
+    for eidx, ((x1, xm, x2), (c1, cm, c2)) in enumerate(zip(grid.elements, chords), start=1):
+        n1, n2, n3 = 2 * eidx - 1, 2 * eidx, 2 * eidx + 1
+        parts.append(_AERO_ELEM_TMPL % (
+            eidx, x1, xm, x2,
+            eidx, eidx,
+            n1, n2, n3,
+            c1, cm, c2,
+            -0.5 * c1, -0.5 * cm, -0.5 * c2,
+        ))
+    write_parts(parts, out_path, out)
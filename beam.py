@@ -1,75 +1,98 @@
 import math
+from typing import BinaryIO, List, Optional
+
+import numpy as np
+
 from io_blade import TipData
 from grid import BladeGrid
+from io_utils import write_parts
+
 
+_DEG2RAD = 0.017453292519943295  # pi / 180
 
-def _fe(x: float) -> str:
-    return f"{x:.6e}"
+# Per-element header and the three node blocks of a beam3 card
+_NODE_FMT = (
+    "    CURR_ROTOR + CURR_blade + %d\n"
+    "        position, reference, CURR_ROTOR + CURR_blade + NEUTR + %d, 0., %.10f, %.10f,\n"
+    "        orientation, reference, CURR_ROTOR + CURR_blade + NEUTR + %d, eye,\n"
+)
+_ELEM_FMT = (
+    "# element %d: x1=%.10f xm=%.10f x2=%.10f\n"
+    "beam3:\n"
+    "    CURR_ROTOR + CURR_blade + %d,\n"
+    + _NODE_FMT * 3
+    + "        from nodes,\n"
+)
 
+# Structurally nonzero cells of the section stiffness matrix, row-major
+_K_NONZERO = ((0, 0), (0, 4), (0, 5), (1, 1), (2, 2), (3, 3),
+              (4, 0), (4, 4), (4, 5), (5, 0), (5, 4), (5, 5))
 
-def _f(x: float) -> str:
-    return f"{x:.10f}"
+# One %-template per stiffness matrix; the structural zeros are literal text
+_MATRIX_FMT = (
+    "        linear elastic generic, matr,\n"
+    + ",\n".join(
+        "            " + ", ".join("%.6e" if (r, c) in _K_NONZERO else "0.000000e+00" for c in range(6))
+        for r in range(6)
+    )
+    + ";\n"
+)
 
+# A whole element card: header, node blocks and both Gauss-point matrices
+_ELEM_CARD_FMT = _ELEM_FMT + _MATRIX_FMT * 2
 
-def _assemble_K(EA, EJY, EJZ, GJ, Y1, Z1, rot_deg, nu):
-    c = math.cos(math.radians(rot_deg)); s = math.sin(math.radians(rot_deg))
+
+def _assemble_K_batch(EA, EJY, EJZ, GJ, Y1, Z1, rot_rad, nu) -> np.ndarray:
+    """Return the (n, 12) nonzero cells (see _K_NONZERO) of the stiffness matrix at n points."""
+    c = np.cos(rot_rad); s = np.sin(rot_rad)
+    c2, s2, cs = c * c, s * s, c * s
+    Za, Ya = Z1 * EA, Y1 * EA
     GA = EA / (2 * (1 + nu))
-    A22 = EJY * c * c + EJZ * s * s + (Z1 ** 2) * EA
-    A33 = EJZ * c * c + EJY * s * s + (Y1 ** 2) * EA
-    A23 = (EJY - EJZ) * c * s - Y1 * Z1 * EA
-    return [
-        [EA, 0, 0, 0, Z1 * EA, -Y1 * EA],
-        [0, GA, 0, 0, 0, 0],
-        [0, 0, GA, 0, 0, 0],
-        [0, 0, 0, GJ, 0, 0],
-        [Z1 * EA, 0, 0, 0, A22, A23],
-        [-Y1 * EA, 0, 0, 0, A23, A33],
-    ]
-
-
-def write_beam_file(tip: TipData, grid: BladeGrid, name: str, nu: float, out_path: str, y_sign: float = 1.0) -> None:
-    if grid.interp_tip is None:
+    A22 = EJY * c2 + EJZ * s2 + Z1 * Za
+    A33 = EJZ * c2 + EJY * s2 + Y1 * Ya
+    A23 = (EJY - EJZ) * cs - Z1 * Ya
+    return np.column_stack([EA, Za, -Ya, GA, GA, GJ, Za, A22, A23, -Ya, A23, A33])
+
+
+def write_beam_file(
+    tip: TipData,
+    grid: BladeGrid,
+    name: str,
+    nu: float,
+    out_path: str,
+    y_sign: float = 1.0,
+    *,
+    out: Optional[BinaryIO] = None,
+) -> None:
+    if grid.interp_tip_many is None:
         raise RuntimeError("attach_interpolators() first.")
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("# blade.beam\n")
-        f.write(f"# name={name}\n")
-        for eidx, (x1, xm, x2) in enumerate(grid.elements, start=1):
-            n1, n2, n3 = 2 * eidx - 1, 2 * eidx, 2 * eidx + 1
-
-            def K_at(xev: float):
-                EA = grid.interp_tip("EA", xev)
-                EJY = grid.interp_tip("EJY", xev)
-                EJZ = grid.interp_tip("EJZ", xev)
-                GJ = grid.interp_tip("GJ", xev)
-                rot = grid.interp_tip("ROTAN_deg", xev) * y_sign
-                yct = y_sign * grid.interp_tip("YCT", xev)
-                zct = grid.interp_tip("ZCT", xev)
-                yna = y_sign * grid.interp_tip("YNA", xev)
-                zna = grid.interp_tip("ZNA", xev)
-                Y1 = yct - yna
-                Z1 = zct - zna
-                return _assemble_K(EA, EJY, EJZ, GJ, Y1, Z1, rot, nu)
-
-            K1 = K_at(xm - 0.5 / math.sqrt(3) * (x2 - x1))
-            K2 = K_at(xm + 0.5 / math.sqrt(3) * (x2 - x1))
-
-            f.write(f"# element {eidx}: x1={_f(x1)} xm={_f(xm)} x2={_f(x2)}\n")
-            f.write("beam3:\n")
-            f.write(f"    CURR_ROTOR + CURR_blade + {eidx},\n")
-            for nid in (n1, n2, n3):
-                f.write(f"    CURR_ROTOR + CURR_blade + {nid}\n")
-                f.write("        position, reference, CURR_ROTOR + CURR_blade + NEUTR + ")
-                f.write(f"{nid}, 0., ")
-                yct = y_sign * grid.interp_tip("YCT", grid.nodes[nid - 1])
-                zct = grid.interp_tip("ZCT", grid.nodes[nid - 1])
-                yna = y_sign * grid.interp_tip("YNA", grid.nodes[nid - 1])
-                zna = grid.interp_tip("ZNA", grid.nodes[nid - 1])
-                f.write(f"{_f(yct - yna)}, {_f(zct - zna)},\n")
-                f.write(f"        orientation, reference, CURR_ROTOR + CURR_blade + NEUTR + {nid}, eye,\n")
-            f.write("        from nodes,\n")
-            for sec, K in enumerate((K1, K2), start=1):
-                f.write("        linear elastic generic, matr,\n")
-                for r in range(6):
-                    row = ", ".join(_fe(K[r][c]) for c in range(6))
-                    end = ";\n" if r == 5 else ",\n"
-                    f.write(f"            {row}{end}")
+
+    # Both Gauss points of every element, interleaved as (e1_1, e1_2, e2_1, ...)
+    x1s, xms, x2s = grid.elem_x1, grid.elem_xm, grid.elem_x2
+    half = 0.5 / math.sqrt(3) * (x2s - x1s)
+    xev = np.stack([xms - half, xms + half], axis=1).ravel()
+
+    interp = grid.interp_tip_many
+    YCT, YNA, ZCT, ZNA, EA, EJY, EJZ, GJ, ROTAN = interp(
+        ("YCT", "YNA", "ZCT", "ZNA", "EA", "EJY", "EJZ", "GJ", "ROTAN_deg"), xev
+    )
+    Ks = _assemble_K_batch(
+        EA, EJY, EJZ, GJ, y_sign * YCT - y_sign * YNA, ZCT - ZNA,
+        ROTAN * (y_sign * _DEG2RAD), nu,
+    ).tolist()
+
+    # Offsets of every node from its neutral-axis reference, computed once
+    YCT, YNA, ZCT, ZNA = interp(("YCT", "YNA", "ZCT", "ZNA"), grid.nodes_arr)
+    y_off = (y_sign * YCT - y_sign * YNA).tolist()
+    z_off = (ZCT - ZNA).tolist()
+
+    parts: List[str] = ["# blade.beam\n", f"# name={name}\n"]
+    for eidx, (x1, xm, x2) in enumerate(grid.elements, start=1):
+        n1, n2, n3 = 2 * eidx - 1, 2 * eidx, 2 * eidx + 1
+        args = [eidx, x1, xm, x2, eidx]
+        for nid in (n1, n2, n3):
+            args += (nid, nid, y_off[nid - 1], z_off[nid - 1], nid)
+        args += Ks[2 * eidx - 2]
+        args += Ks[2 * eidx - 1]
+        parts.append(_ELEM_CARD_FMT % tuple(args))
+    write_parts(parts, out_path, out)
@@ -1,63 +1,71 @@
+from typing import BinaryIO, List, Optional
+
+import numpy as np
+
 from io_blade import TipData
 from grid import BladeGrid
+from io_utils import write_parts
 
 
 def _fe(x: float) -> str:
-    return f"{x:.6e}"
-
-
-def _f(x: float) -> str:
-    return f"{x:.10f}"
+    return "%.6e" % x
 
 
 def _mean2(a, b):
     return 0.5 * (a + b)
 
 
-def write_bodies_file(tip: TipData, grid: BladeGrid, name: str, out_path: str) -> None:
-    if grid.interp_tip is None:
+def _pos(x: np.ndarray) -> np.ndarray:
+    """Element-wise max(0.0, x) with Python's semantics (x kept only if x > 0)."""
+    return np.where(x > 0.0, x, 0.0)
+
+
+# Per-node lumped body card
+_BODY_FMT = (
+    "# node %d: x=[%.10f, %.10f], dL=%.10f\n"
+    "body: CURR_ROTOR + CURR_blade + %d, CURR_ROTOR + CURR_blade + %d\n"
+    "    ,\n"
+    "    %.6e,\n"
+    "    reference, CURR_ROTOR + CURR_blade + BODY + %d, 0., 0., 0.,\n"
+    "    reference, CURR_ROTOR + CURR_blade + BODY + %d,\n"
+    "        diag, %.6e, %.6e, %.6e\n"
+    ";\n\n"
+)
+
+
+def write_bodies_file(tip: TipData, grid: BladeGrid, name: str, out_path: str, *, out: Optional[BinaryIO] = None) -> None:
+    if grid.interp_tip_many is None:
         raise RuntimeError("attach_interpolators() first.")
-    nodes = grid.nodes
+    nodes = grid.nodes_arr
     N = len(nodes)
     sections = grid.sections
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("# blade.body\n")
-        f.write(f"# name={name}\n")
-        total = 0.0
-        for i, _x in enumerate(nodes, start=1):
-            if i == 1:
-                xL = sections[0]
-                xR = 0.5 * (nodes[0] + nodes[1]) if N > 1 else sections[-1]
-            elif i == N:
-                xL = 0.5 * (nodes[N - 2] + nodes[N - 1]) if N > 1 else sections[0]
-                xR = sections[-1]
-            else:
-                xL = 0.5 * (nodes[i - 2] + nodes[i - 1])
-                xR = 0.5 * (nodes[i - 1] + nodes[i])
-            dL = max(0.0, xR - xL)
-            if dL <= 0:
-                M = JX = JY = JZ = 0.0
-            else:
-                dM_L = grid.interp_tip("dM", xL)
-                dM_R = grid.interp_tip("dM", xR)
-                dJX_L = grid.interp_tip("dJX", xL)
-                dJX_R = grid.interp_tip("dJX", xR)
-                dJY_L = grid.interp_tip("dJY", xL)
-                dJY_R = grid.interp_tip("dJY", xR)
-                dJZ_L = grid.interp_tip("dJZ", xL)
-                dJZ_R = grid.interp_tip("dJZ", xR)
-                M = max(0.0, _mean2(dM_L, dM_R) * dL)
-                JX = max(0.0, _mean2(dJX_L, dJX_R) * dL)
-                rod = (M * dL * dL) / 12.0
-                JY = max(0.0, _mean2(dJY_L, dJY_R) * dL + rod)
-                JZ = max(0.0, _mean2(dJZ_L, dJZ_R) * dL + rod)
-            total += M
-            f.write(f"# node {i}: x=[{_f(xL)}, {_f(xR)}], dL={_f(dL)}\n")
-            f.write(f"body: CURR_ROTOR + CURR_blade + {i}, CURR_ROTOR + CURR_blade + {i}\n")
-            f.write("    ,\n")
-            f.write(f"    {_fe(M)},\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + BODY + {i}, 0., 0., 0.,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + BODY + {i},\n")
-            f.write(f"        diag, {_fe(JX)}, {_fe(JY)}, {_fe(JZ)}\n")
-            f.write(";\n\n")
-        f.write(f"# total_mass = {_fe(total)}\n")
+
+    # Lumping interval [xL, xR] of every node: blade ends, then midpoints between neighbours
+    xL = np.empty(N)
+    xR = np.empty(N)
+    xL[0], xR[-1] = sections[0], sections[-1]
+    if N > 1:
+        mids = 0.5 * (nodes[:-1] + nodes[1:])
+        xL[1:] = mids
+        xR[:-1] = mids
+    dL = _pos(xR - xL)
+    has_len = dL > 0
+
+    # Sectional densities at both interval ends, all fields in one call
+    dM, dJX, dJY, dJZ = _mean2(*np.split(
+        grid.interp_tip_many(("dM", "dJX", "dJY", "dJZ"), np.concatenate([xL, xR])), 2, axis=1
+    ))
+    M = np.where(has_len, _pos(dM * dL), 0.0)
+    JX = np.where(has_len, _pos(dJX * dL), 0.0)
+    rod = (M * dL * dL) / 12.0
+    JY = np.where(has_len, _pos(dJY * dL + rod), 0.0)
+    JZ = np.where(has_len, _pos(dJZ * dL + rod), 0.0)
+
+    parts: List[str] = ["# blade.body\n", f"# name={name}\n"]
+    total = 0.0
+    rows = zip(xL.tolist(), xR.tolist(), dL.tolist(), M.tolist(), JX.tolist(), JY.tolist(), JZ.tolist())
+    for i, (xl, xr, dl, m, jx, jy, jz) in enumerate(rows, start=1):
+        total += m
+        parts.append(_BODY_FMT % (i, xl, xr, dl, i, i, m, i, i, jx, jy, jz))
+    parts.append(f"# total_mass = {_fe(total)}\n")
+    write_parts(parts, out_path, out)
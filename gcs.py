@@ -2,11 +2,25 @@
 """Writers for global coordinate system reference files."""
 from typing import List
 
+from io_utils import write_parts
 from rotors_xml import RotorCfg
 
 
-def _f(x: float) -> str:
-    return f"{x:.10f}"
+# Rotor centre frame and the per-blade base frames rotated about its Z axis
+_ROTOR_REF_FMT = (
+    "reference: ROTOR_%d, #gen ref\n"
+    "    reference, global, %.10f, %.10f, %.10f,\n"
+    "    reference, global, eye,\n"
+    "    reference, global, null,\n"
+    "    reference, global, null;\n\n"
+)
+_BLADE_BASE_FMT = (
+    "reference: ROTOR_%d_blade1_BASE%d, #第%d片\n"
+    "    reference, ROTOR_%d, 0.0000000000, 0.0000000000, 0.0000000000,\n"
+    "    reference, ROTOR_%d, eulr,0,0,%.10f*degrad,\n"
+    "    reference, ROTOR_%d, null,\n"
+    "    reference, ROTOR_%d, null;\n\n"
+)
 
 
 def _angle_list(n: int, cw: bool) -> List[float]:
@@ -24,26 +38,14 @@ def write_gcs_refs(rotors: List[RotorCfg], out_path: str, add_blade_bases: bool
       - ROTOR_i_blade1_BASEk, k=1..blade_count, rotated about Z by eulr(0,0,angle*degrad)
         angle sign: CCW positive, CW negative
     """
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("# GCS.ref\n")
-        for r in rotors:
-            x, y, z = r.center_xyz
-            f.write(f"reference: ROTOR_{r.index}, #gen ref\n")
-            f.write(f"    reference, global, {_f(x)}, {_f(y)}, {_f(z)},\n")
-            f.write("    reference, global, eye,\n")
-            f.write("    reference, global, null,\n")
-            f.write("    reference, global, null;\n\n")
-
-            if add_blade_bases:
-                cw = ("顺时" in (r.direction or "")) or ((r.direction or "").strip().lower() == "cw")
-                angles = _angle_list(max(1, r.blade_count), cw)
-                for k, ang in enumerate(angles, start=1):
-                    f.write(f"reference: ROTOR_{r.index}_blade1_BASE{k}, #第{k}片\n")
-                    f.write(
-                        f"    reference, ROTOR_{r.index}, 0.0000000000, 0.0000000000, 0.0000000000,\n"
-                    )
-                    f.write(
-                        f"    reference, ROTOR_{r.index}, eulr,0,0,{ang:.10f}*degrad,\n"
-                    )
-                    f.write(f"    reference, ROTOR_{r.index}, null,\n")
-                    f.write(f"    reference, ROTOR_{r.index}, null;\n\n")
+    parts: List[str] = ["# GCS.ref\n"]
+    for r in rotors:
+        x, y, z = r.center_xyz
+        parts.append(_ROTOR_REF_FMT % (r.index, x, y, z))
+
+        if add_blade_bases:
+            cw = ("顺时" in (r.direction or "")) or ((r.direction or "").strip().lower() == "cw")
+            angles = _angle_list(max(1, r.blade_count), cw)
+            idx = r.index
+            parts += [_BLADE_BASE_FMT % (idx, k, k, idx, idx, ang, idx, idx) for k, ang in enumerate(angles, start=1)]
+    write_parts(parts, out_path)
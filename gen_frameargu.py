@@ -2,25 +2,24 @@ from __future__ import annotations
 
 import os
 import xml.etree.ElementTree as ET
-from typing import List, Tuple
+from typing import Optional
 
-from femgen_mb import generate_fem
-from io_utils import parse_triplet, rel_include_line, write_text
+from io_utils import Includes, parse_triplet, rel_include_line, write_text
 
 
-def generate(aer_frameargu_xml: str, out_dir: str) -> Tuple[List[str], List[str]]:
-    """Produce frameargu artifacts and include lines when FEM inputs are valid."""
+def generate(aer_frameargu_xml: str, out_dir: str, includes: Optional[Includes] = None) -> Includes:
+    """Produce frameargu artifacts when FEM inputs are valid, appending include lines to *includes*."""
 
-    node_includes: List[str] = []
-    element_includes: List[str] = []
+    if includes is None:
+        includes = Includes()
 
     if not os.path.isfile(aer_frameargu_xml):
-        return node_includes, element_includes
+        return includes
 
     root = ET.parse(aer_frameargu_xml).getroot()
     jet = root.find("机身1")
     if jet is None:
-        return node_includes, element_includes
+        return includes
 
     origin_text = (jet.findtext("原点位置") or "").strip()
     ox, oy, oz = parse_triplet(origin_text)
@@ -28,7 +27,10 @@ def generate(aer_frameargu_xml: str, out_dir: str) -> Tuple[List[str], List[str]
     bdf_path = (jet.findtext("结构模型文件") or "").strip()
     f06_path = (jet.findtext("模态结果文件") or "").strip()
     if not (bdf_path and f06_path and os.path.isfile(bdf_path) and os.path.isfile(f06_path)):
-        return node_includes, element_includes
+        return includes
+
+    # Optional FEM converter: only needed once a complete airframe model is configured
+    from femgen_mb import generate_fem
 
     fem_path = os.path.join(out_dir, "frameargu.fem")
     generate_fem(f06_path, bdf_path, fem_path)
@@ -42,10 +44,10 @@ def generate(aer_frameargu_xml: str, out_dir: str) -> Tuple[List[str], List[str]
         "    reference, global, null,\n"
         "    reference, global, null;\n",
     )
-    node_includes.append(rel_include_line(nod_path, start_dir=out_dir, indent=4))
+    includes.node.append(rel_include_line(nod_path, start_dir=out_dir, indent=4))
 
     elm_path = os.path.join(out_dir, "frameargu.elm")
     write_text(elm_path, rel_include_line(fem_path, start_dir=out_dir, indent=0) + "\n")
-    element_includes.append(rel_include_line(elm_path, start_dir=out_dir, indent=4))
+    includes.element.append(rel_include_line(elm_path, start_dir=out_dir, indent=4))
 
-    return node_includes, element_includes
+    return includes
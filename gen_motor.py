@@ -2,19 +2,19 @@ from __future__ import annotations
 
 import os
 import xml.etree.ElementTree as ET
-from typing import List, Tuple
+from typing import Optional
 
-from io_utils import parse_triplet, rel_include_line, write_text
+from io_utils import Includes, parse_triplet, rel_include_line, write_text
 
 
-def generate(act_motor_xml: str, out_dir: str) -> Tuple[List[str], List[str]]:
-    """Produce motor artifacts from act_motor.xml if available."""
+def generate(act_motor_xml: str, out_dir: str, includes: Optional[Includes] = None) -> Includes:
+    """Produce motor artifacts from act_motor.xml if available, appending include lines to *includes*."""
 
-    node_includes: List[str] = []
-    element_includes: List[str] = []
+    if includes is None:
+        includes = Includes()
 
     if not os.path.isfile(act_motor_xml):
-        return node_includes, element_includes
+        return includes
 
     root = ET.parse(act_motor_xml).getroot()
 
@@ -36,7 +36,7 @@ def generate(act_motor_xml: str, out_dir: str) -> Tuple[List[str], List[str]]:
         "    reference, global, null,\n"
         "    reference, global, null;\n",
     )
-    node_includes.append(rel_include_line(nod_path, start_dir=out_dir, indent=4))
+    includes.node.append(rel_include_line(nod_path, start_dir=out_dir, indent=4))
 
     elm_path = os.path.join(out_dir, "motor.elm")
     write_text(
@@ -47,6 +47,6 @@ def generate(act_motor_xml: str, out_dir: str) -> Tuple[List[str], List[str]]:
         f"    reference, global, eulr, {rx:.6g}, {ry:.6g}, {rz:.6g},\n"
         f"        diag, {i1:.6g}, {i2:.6g}, {i3:.6g};\n",
     )
-    element_includes.append(rel_include_line(elm_path, start_dir=out_dir, indent=4))
+    includes.element.append(rel_include_line(elm_path, start_dir=out_dir, indent=4))
 
-    return node_includes, element_includes
+    return includes
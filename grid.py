@@ -15,7 +15,14 @@ from typing import List, Tuple, Callable, Optional, Dict
 import math
 import numpy as np
 
-from io_blade import TipData, AeroData
+from io_blade import TIP_FIELDS, TipData, AeroData
+from select_sections import SectionReport, SectionSelectionConfig, auto_select_sections
+
+# Tip fields exposed through the interpolators, in the order of the old per-field map
+TIP_INTERP_FIELDS: Tuple[str, ...] = (
+    "EA", "EJY", "EJZ", "GJ", "YNA", "ZNA", "YCT", "ZCT", "ROTAN_deg", "ROTAPI_deg",
+    "dM", "dJX", "dJY", "dJZ", "YCG", "ZCG",
+)
 
 
 @dataclass
@@ -24,13 +31,18 @@ class BladeGrid:
     nodes: List[float]                    # 2K-1 end–mid–end nodes
     elements: List[Tuple[float, float, float]]   # [(x1,xm,x2)] length K-1
     eval_points: List[Tuple[float, float]]       # [(x_ev1,x_ev2)] length K-1
+    # SoA copies of nodes/elements for vectorised writers (filled by build_grid)
+    nodes_arr: Optional[np.ndarray] = None        # (2K-1,)
+    elem_x1: Optional[np.ndarray] = None          # (K-1,)
+    elem_xm: Optional[np.ndarray] = None          # (K-1,)
+    elem_x2: Optional[np.ndarray] = None          # (K-1,)
     # Interpolation callables are set by attach_interpolators()
     interp_tip: Optional[Callable[[str, float], float]] = None
     interp_aero: Optional[Callable[[str, float], float]] = None
-
-
-def _strictly_increasing(xs: List[float]) -> bool:
-    return all(xs[i+1] - xs[i] > 0.0 for i in range(len(xs)-1))
+    # Batched counterparts: interp_aero_vec(field_name, xs) -> ndarray
+    interp_aero_vec: Optional[Callable[[str, np.ndarray], np.ndarray]] = None
+    # Multi-field batch: interp_tip_many(field_names, xs) -> (len(field_names), len(xs)) ndarray
+    interp_tip_many: Optional[Callable[[Tuple[str, ...], np.ndarray], np.ndarray]] = None
 
 
 def build_grid(sections: List[float]) -> BladeGrid:
@@ -54,81 +66,141 @@ def build_grid(sections: List[float]) -> BladeGrid:
     """
     if sections is None or len(sections) < 2:
         raise ValueError("Need at least 2 control sections.")
-    secs = [float(s) for s in sections]
-    if not _strictly_increasing(secs):
+    secs_arr = np.asarray(sections, dtype=float)
+    if not bool(np.all(np.diff(secs_arr) > 0.0)):
         raise ValueError("Sections must be strictly increasing without duplicates.")
+    return _grid_from_sections(secs_arr)
 
-    # Build nodes: end–mid–end pattern for each interval
-    nodes: List[float] = []
-    elements: List[Tuple[float, float, float]] = []
-    eval_points: List[Tuple[float, float]] = []
-
-    inv_sqrt3 = 1.0 / math.sqrt(3.0)
-
-    for i in range(len(secs) - 1):
-        x1, x2 = secs[i], secs[i+1]
-        xm = 0.5 * (x1 + x2)
-
-        if i == 0:
-            nodes.append(x1)   # first interval includes its left end
 
-        nodes.append(xm)
-        nodes.append(x2)
+def _grid_from_sections(secs_arr: np.ndarray) -> BladeGrid:
+    """build_grid() body for an already validated (K,) array of sections."""
+    # Interval ends/midpoints, then nodes in end–mid–end order: r0, m01, r1, m12, ..., rK-1
+    x1, x2 = secs_arr[:-1], secs_arr[1:]
+    xm = 0.5 * (x1 + x2)
+    nodes_arr = np.empty(2 * secs_arr.size - 1)
+    nodes_arr[0::2] = secs_arr
+    nodes_arr[1::2] = xm
 
-        elements.append((x1, xm, x2))
-
-        half = 0.5 * (x2 - x1)
-        x_ev1 = xm - 0.5 * inv_sqrt3 * (x2 - x1)
-        x_ev2 = xm + 0.5 * inv_sqrt3 * (x2 - x1)
-        eval_points.append((x_ev1, x_ev2))
+    # Gauss 2-point evaluation points
+    d = 0.5 * (1.0 / math.sqrt(3.0)) * (x2 - x1)
 
     return BladeGrid(
-        sections=secs,
-        nodes=nodes,
-        elements=elements,
-        eval_points=eval_points,
+        sections=secs_arr.tolist(),
+        nodes=nodes_arr.tolist(),
+        elements=list(zip(x1.tolist(), xm.tolist(), x2.tolist())),
+        eval_points=list(zip((xm - d).tolist(), (xm + d).tolist())),
+        nodes_arr=nodes_arr,
+        elem_x1=x1,
+        elem_xm=xm,
+        elem_x2=x2,
         interp_tip=None,
         interp_aero=None,
+        interp_aero_vec=None,
+        interp_tip_many=None,
     )
 
 
-def _make_interp_closure(x: np.ndarray, field_map: Dict[str, np.ndarray]) -> Callable[[str, float], float]:
-    """
-    Build a closure: interp(field_name, x_query) -> float
-    - Linear interpolation with clamping to [x_min, x_max]
-    - field_name must exist in field_map; otherwise KeyError
-    """
+def _sorted_fields(x: np.ndarray, field_map: Dict[str, np.ndarray]) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Validate abscissa/fields and return both reordered to ascending x."""
     x = np.asarray(x, dtype=float)
     if x.ndim != 1 or x.size == 0:
         raise ValueError("Interpolation abscissa must be a non-empty 1D array.")
-    # ensure ascending; io.load_* should already give sorted, but double-guard here
-    order = np.argsort(x)
-    x = x[order]
+    # ensure ascending; io.load_* should already give sorted, so only reorder when needed
+    order = None
+    if x.size > 1 and not bool(np.all(x[1:] >= x[:-1])):
+        order = np.argsort(x)
+        x = x[order]
 
-    # reindex all fields to ascending order
+    # reindex all fields to ascending order (views when no reordering was needed)
     fmap: Dict[str, np.ndarray] = {}
     for k, v in field_map.items():
         arr = np.asarray(v, dtype=float)
         if arr.shape != x.shape:
             raise ValueError(f"Field '{k}' length {arr.shape} does not match x length {x.shape}.")
-        fmap[k] = arr[order]
+        fmap[k] = arr if order is None else arr[order]
+    return x, fmap
 
-    x_min, x_max = float(x[0]), float(x[-1])
 
-    def interp(field_name: str, xq: float) -> float:
-        if field_name not in fmap:
-            raise KeyError(f"Unknown field '{field_name}'.")
-        y = fmap[field_name]
-        # clamp then interp
-        if xq <= x_min:
-            return float(y[0])
-        if xq >= x_max:
-            return float(y[-1])
+def _field_lookup(x: np.ndarray, y: np.ndarray) -> Callable[[float], float]:
+    """Scalar interp1(x_query) for one field: np.interp, clamped to the edge values."""
+
+    def interp1(xq: float) -> float:
         return float(np.interp(xq, x, y))
 
+    return interp1
+
+
+def _make_interp_closure(x: np.ndarray, field_map: Dict[str, np.ndarray]) -> Callable[[str, float], float]:
+    """
+    Build a closure: interp(field_name, x_query) -> float
+    - Linear interpolation with clamping to [x_min, x_max]
+    - field_name must exist in field_map; otherwise KeyError
+    """
+    x, fmap = _sorted_fields(x, field_map)
+    lookups = {k: _field_lookup(x, y) for k, y in fmap.items()}
+
+    def interp(field_name: str, xq: float) -> float:
+        try:
+            interp1 = lookups[field_name]
+        except KeyError:
+            raise KeyError(f"Unknown field '{field_name}'.") from None
+        return interp1(xq)
+
     return interp
 
 
+def _make_interp_vec_closure(x: np.ndarray, field_map: Dict[str, np.ndarray]) -> Callable[[str, np.ndarray], np.ndarray]:
+    """
+    Build a closure: interp_vec(field_name, xs) -> ndarray
+    - Same rules as _make_interp_closure, evaluated for all xs in one np.interp call
+      (np.interp clamps to the edge values itself)
+    """
+    x, fmap = _sorted_fields(x, field_map)
+
+    def interp_vec(field_name: str, xs: np.ndarray) -> np.ndarray:
+        try:
+            y = fmap[field_name]
+        except KeyError:
+            raise KeyError(f"Unknown field '{field_name}'.") from None
+        return np.interp(np.asarray(xs, dtype=float), x, y)
+
+    return interp_vec
+
+
+def _make_interp_many_closure(x: np.ndarray, field_map: Dict[str, np.ndarray]) -> Callable[[Tuple[str, ...], np.ndarray], np.ndarray]:
+    """
+    Build a closure: interp_many(field_names, xs) -> ndarray of shape (F, Q)
+    - Same rules as _make_interp_vec_closure; the fields are stacked into one
+      matrix and the bracketing segments are located once for all of them
+    """
+    x, fmap = _sorted_fields(x, field_map)
+    rows = {k: i for i, k in enumerate(fmap)}
+    Y = np.stack(list(fmap.values()))
+    F = Y.shape[0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        S = np.diff(Y, axis=1) / np.diff(x)  # (F, N-1) segment slopes
+    # Tables indexed by k = searchsorted(x, xq, "right") in [0, N]: a flat segment is
+    # padded on each side, so k = 0 (below x_min) and k = N (at/above x_max) yield the
+    # edge values without any branch; -0.0 keeps y + slope*dx == y for dx >= 0
+    Xp = np.concatenate([x[:1], x])
+    Yp = np.concatenate([Y[:, :1], Y], axis=1)
+    Sp = np.concatenate([np.zeros((F, 1)), S, np.full((F, 1), -0.0)], axis=1)
+
+    def interp_many(field_names: Tuple[str, ...], xs: np.ndarray) -> np.ndarray:
+        try:
+            sel = [rows[k] for k in field_names]
+        except KeyError as exc:
+            raise KeyError(f"Unknown field '{exc.args[0]}'.") from None
+        xs = np.asarray(xs, dtype=float)
+        k = np.searchsorted(x, xs, side="right")
+        d = xs - Xp[k]
+        y0 = Yp[sel][:, k]
+        # A query on a station returns the tabulated value itself (keeps its sign of zero)
+        return np.where(d == 0.0, y0, Sp[sel][:, k] * d + y0)
+
+    return interp_many
+
+
 def attach_interpolators(grid: BladeGrid,
                          tip: TipData,
                          aero: Optional[AeroData]) -> BladeGrid:
@@ -136,6 +208,8 @@ def attach_interpolators(grid: BladeGrid,
     Attach linear interpolation closures to grid:
       grid.interp_tip(field_name, x) -> float
       grid.interp_aero(field_name, x) -> float  (None if aero is None)
+      grid.interp_aero_vec(field_name, xs) -> ndarray
+      grid.interp_tip_many(field_names, xs) -> (F, Q) ndarray
 
     Interpolation rules
     -------------------
@@ -146,26 +220,17 @@ def attach_interpolators(grid: BladeGrid,
          'dM','dJX','dJY','dJZ','YCG','ZCG']
     - Supported aero fields: at least ['Chord'] (others passthrough if provided).
     """
-    # TipData fields map
-    tip_field_map = {
-        "EA":        np.asarray(tip.EA, dtype=float),
-        "EJY":       np.asarray(tip.EJY, dtype=float),
-        "EJZ":       np.asarray(tip.EJZ, dtype=float),
-        "GJ":        np.asarray(tip.GJ, dtype=float),
-        "YNA":       np.asarray(tip.YNA, dtype=float),
-        "ZNA":       np.asarray(tip.ZNA, dtype=float),
-        "YCT":       np.asarray(tip.YCT, dtype=float),
-        "ZCT":       np.asarray(tip.ZCT, dtype=float),
-        "ROTAN_deg": np.asarray(tip.ROTAN_deg, dtype=float),
-        "ROTAPI_deg":np.asarray(tip.ROTAPI_deg, dtype=float),
-        "dM":        np.asarray(tip.dM, dtype=float),
-        "dJX":       np.asarray(tip.dJX, dtype=float),
-        "dJY":       np.asarray(tip.dJY, dtype=float),
-        "dJZ":       np.asarray(tip.dJZ, dtype=float),
-        "YCG":       np.asarray(tip.YCG, dtype=float),
-        "ZCG":       np.asarray(tip.ZCG, dtype=float),
-    }
-    grid.interp_tip = _make_interp_closure(np.asarray(tip.STA, dtype=float), tip_field_map)
+    # TipData fields map: rows of the loader's contiguous table when present
+    table = getattr(tip, "table", None)
+    if table is not None:
+        rows = dict(zip(TIP_FIELDS, table))
+        tip_x = rows.pop("STA")
+        tip_field_map = {k: rows[k] for k in TIP_INTERP_FIELDS}
+    else:
+        tip_field_map = {k: np.asarray(getattr(tip, k), dtype=float) for k in TIP_INTERP_FIELDS}
+        tip_x = np.asarray(tip.STA, dtype=float)
+    grid.interp_tip = _make_interp_closure(tip_x, tip_field_map)
+    grid.interp_tip_many = _make_interp_many_closure(tip_x, tip_field_map)
 
     # AeroData fields map (optional)
     if aero is not None:
@@ -180,8 +245,27 @@ def attach_interpolators(grid: BladeGrid,
         if aero.Anhedral is not None:
             aero_field_map["Anhedral"] = np.asarray(aero.Anhedral, dtype=float)
 
-        grid.interp_aero = _make_interp_closure(np.asarray(aero.Radial, dtype=float), aero_field_map)
+        aero_x = np.asarray(aero.Radial, dtype=float)
+        grid.interp_aero = _make_interp_closure(aero_x, aero_field_map)
+        grid.interp_aero_vec = _make_interp_vec_closure(aero_x, aero_field_map)
     else:
         grid.interp_aero = None
+        grid.interp_aero_vec = None
 
     return grid
+
+
+def build_blade_grid(tip: TipData,
+                     aero: Optional[AeroData],
+                     sel_cfg: SectionSelectionConfig) -> Tuple[BladeGrid, SectionReport]:
+    """
+    auto_select_sections() + build_grid() + attach_interpolators() in one call.
+
+    The selector already returns sorted sections at least 1e-12 apart, so the
+    grid is built from them directly without build_grid()'s re-validation.
+    """
+    sections, report = auto_select_sections(tip, aero, sel_cfg)
+    if len(sections) < 2:
+        raise ValueError("Need at least 2 control sections.")
+    grid = _grid_from_sections(np.asarray(sections, dtype=float))
+    return attach_interpolators(grid, tip, aero), report
@@ -22,34 +22,47 @@ Coordinate mapping (performed here, once):
     dJY <- JZ,   dJZ <- JX,   dJX <- JP
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any, Tuple
+from dataclasses import dataclass, field, replace
+from typing import Callable, List, Optional, Dict, Any, Tuple
+import copy
 import math
+import re
 import io as _stdlib_io  # avoid shadowing when needed
 import os
 
+import numpy as np
+
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Rows of TipData.table, in order (STA first, then the mapped y/z fields)
+TIP_FIELDS: Tuple[str, ...] = (
+    "STA", "dM", "YCG", "ZCG", "ROTAPI_deg", "ROTAN_deg", "dJX", "dJY", "dJZ",
+    "EA", "EJY", "EJZ", "GJ", "YNA", "ZNA", "YCT", "ZCT",
+)
+
+
 @dataclass
 class TipData:
-    STA:   List[float]
-    dM:    List[float]   # from WEIGHT (line mass density; units kept 'raw')
-    YCG:   List[float]
-    ZCG:   List[float]
-    ROTAPI_deg: List[float]
-    ROTAN_deg:  List[float]
-    dJX:   List[float]   # from JP (polar) — kept as provided
-    dJY:   List[float]   # from JZ (X/Z → y/z mapping)
-    dJZ:   List[float]   # from JX (X/Z → y/z mapping)
-    EA:    List[float]
-    EJY:   List[float]   # from EJX (X/Z → y/z mapping)
-    EJZ:   List[float]
-    GJ:    List[float]
-    YNA:   List[float]   # from ZNA
-    ZNA:   List[float]   # from XNA
-    YCT:   List[float]   # from ZCT
-    ZCT:   List[float]   # from XCT
+    STA:   np.ndarray
+    dM:    np.ndarray   # from WEIGHT (line mass density; units kept 'raw')
+    YCG:   np.ndarray
+    ZCG:   np.ndarray
+    ROTAPI_deg: np.ndarray
+    ROTAN_deg:  np.ndarray
+    dJX:   np.ndarray   # from JP (polar) — kept as provided
+    dJY:   np.ndarray   # from JZ (X/Z → y/z mapping)
+    dJZ:   np.ndarray   # from JX (X/Z → y/z mapping)
+    EA:    np.ndarray
+    EJY:   np.ndarray   # from EJX (X/Z → y/z mapping)
+    EJZ:   np.ndarray
+    GJ:    np.ndarray
+    YNA:   np.ndarray   # from ZNA
+    ZNA:   np.ndarray   # from XNA
+    YCT:   np.ndarray   # from ZCT
+    ZCT:   np.ndarray   # from XCT
     meta:  Dict[str, Any]  # e.g., {'warnings': [...], 'header': [...], 'cols': {...}, 'units_policy': 'raw'}
+    # (len(TIP_FIELDS), N) float64 matrix; the named fields above are row views into it
+    table: Optional[np.ndarray] = field(default=None, repr=False)
 
 
 @dataclass
@@ -64,12 +77,22 @@ class AeroData:
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 
+# ASCII characters of a decimal/scientific literal (with float()'s "_" digit grouping);
+# any other ASCII left over after deleting them must spell nan/inf for float() to have
+# a chance. Non-ASCII leftovers (e.g. full-width digits) are left to float() itself.
+_NUMERIC_CHARS = str.maketrans("", "", "0123456789eE+-._")
+_FLOAT_WORDS = frozenset({"nan", "inf", "infinity"})
+
+
 def _is_numeric_row(tokens: List[str]) -> bool:
     """Return True if all tokens parse as float."""
     if not tokens:
         return False
     try:
         for t in tokens:
+            rest = t.translate(_NUMERIC_CHARS)
+            if rest and rest.isascii() and rest.lower() not in _FLOAT_WORDS:
+                return False  # header/units token: reject without raising
             float(t)
         return True
     except Exception:
@@ -78,26 +101,75 @@ def _is_numeric_row(tokens: List[str]) -> bool:
 def _tokenize(line: str) -> List[str]:
     return line.replace(",", " ").split()
 
+# Units-ish fragments; matched as substrings ("m" covers "mm"/"cm", kept for clarity)
+_UNITS_KEYS = frozenset({"deg", "adim", "unit", "lb", "slug", "ft", "m", "kg", "**", "[]", "rad", "in", "mm", "cm"})
+
 def _looks_like_units_line(tokens: List[str]) -> bool:
     """Heuristic: a non-numeric line right after header containing units-ish tokens."""
     text = " ".join(tokens).lower()
-    keys = ["deg", "adim", "unit", "lb", "slug", "ft", "m", "kg", "**", "[]", "rad", "in"]
-    return any(k in text for k in keys)
+    return any(k in text for k in _UNITS_KEYS)
 
 def _dedupe_and_sort(x: List[float], cols: Dict[str, List[float]]) -> Tuple[List[float], Dict[str, List[float]]]:
     """Sort by x ascending and average duplicates (stable mean)."""
-    import numpy as np
     x_arr = np.asarray(x, dtype=float)
-    order = np.argsort(x_arr)
-    x_sorted = x_arr[order]
-    cols_sorted = {k: np.asarray(v, dtype=float)[order] for k, v in cols.items()}
-    # group by unique x
-    uniq, inv = np.unique(x_sorted, return_inverse=True)
-    out = {k: np.zeros_like(uniq, dtype=float) for k in cols_sorted}
-    counts = {k: np.bincount(inv, minlength=len(uniq)) for k in ["_dummy"]}
-    for k, arr in cols_sorted.items():
-        out[k] = np.bincount(inv, weights=arr, minlength=len(uniq)) / np.maximum(counts["_dummy"], 1)
-    return uniq.tolist(), {k: v.tolist() for k, v in out.items()}
+    # 所有字段叠成一张 (F, N) 表，一次累加
+    names = list(cols)
+    M = np.asarray([cols[k] for k in names], dtype=float).reshape(len(names), -1)
+    # group by unique x (np.unique sorts once; no separate argsort pass)
+    uniq, inv = np.unique(x_arr, return_inverse=True)
+    sums = np.zeros((len(names), len(uniq)))
+    np.add.at(sums, (slice(None), inv), M)
+    means = sums / np.maximum(np.bincount(inv, minlength=len(uniq)), 1)
+    return uniq.tolist(), {k: row.tolist() for k, row in zip(names, means)}
+
+def _parse_rows(data_lines: List[str]) -> Tuple[np.ndarray, int]:
+    """
+    Parse TIP data lines into an (R, C) float array in one np.loadtxt call.
+    Ragged rows fall back to per-row float() and are zero-padded to the widest row.
+    Returns (array, length of the shortest row).
+    """
+    lines = [" ".join(_tokenize(ln)) for ln in data_lines if ln.strip()]
+    try:
+        arr = np.loadtxt(_stdlib_io.StringIO("\n".join(lines)), dtype=float, comments=None, ndmin=2)
+        return arr, arr.shape[1]
+    except ValueError:
+        rows = [[float(t) for t in ln.split()] for ln in lines]
+    width = max(len(r) for r in rows)
+    arr = np.zeros((len(rows), width))
+    for i, r in enumerate(rows):
+        arr[i, :len(r)] = r
+    return arr, min(len(r) for r in rows)
+
+# TIP column names, in the fixed order of the XV-15 SI table
+_TIP_COLUMNS = ("SEC", "STA", "WEIGHT", "XCG", "ZCG", "ROTAPI", "JX", "JZ", "JP",
+                "EA", "XNA", "ZNA", "ROTAN", "EJZ", "EJX", "GJ", "XCT", "ZCT")
+
+_NONALNUM_RE = re.compile(r"[^A-Z0-9]")
+# Any character that fails str.isalnum() (Unicode letters and digits are kept)
+_NON_ISALNUM_RE = re.compile(r"[\W_]")
+
+
+def _norm_tip_token(s: str) -> str:
+    """Uppercase and drop everything but A-Z/0-9 (去非字母数字)."""
+    return _NONALNUM_RE.sub("", s.upper().strip())
+
+
+# Last parse of each (abspath, units_policy) next to the file's (mtime_ns, size) at that
+# time; a rewritten file replaces its entry instead of adding one
+_TIP_CACHE: Dict[Tuple[str, str], Tuple[Tuple[int, int], TipData]] = {}
+_AERO_CACHE: Dict[Tuple[str, str], Tuple[Tuple[int, int], AeroData]] = {}
+
+
+def _cached_parse(cache: Dict, path: str, units_policy: str, parse: Callable[[str, str], Any]) -> Any:
+    st = os.stat(path)
+    key = (os.path.abspath(path), units_policy)
+    sig = (st.st_mtime_ns, st.st_size)
+    hit = cache.get(key)
+    if hit is not None and hit[0] == sig:
+        return hit[1]
+    data = parse(path, units_policy)
+    cache[key] = (sig, data)
+    return data
 
 # ─────────────────────────────────────────────────────────────────────────────
 # TIP reader
@@ -109,17 +181,18 @@ def load_tip(path: str, units_policy: str = "si") -> TipData:
     - Prefer the block whose units line is metric (STA->m, WEIGHT->kg/m)
     - Map columns by NAME (case/units-insensitive, substring ok); ignore "..." drift
     - Return TipData with X/Z -> y/z mapping applied
+    - Re-parsed only when the file's mtime or size changes; the shared table is read-only
     """
-    import os, re
     if not os.path.isfile(path):
         raise FileNotFoundError(f"TIP file not found: {path}")
+    tip = _cached_parse(_TIP_CACHE, path, units_policy, _parse_tip)
+    return replace(tip, meta=dict(tip.meta))
+
 
+def _parse_tip(path: str, units_policy: str) -> TipData:
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
         raw = [ln.rstrip("\n") for ln in f]
 
-    def toks(s: str):
-        return s.replace(",", " ").split()
-
     # 1) 找到所有 BLADE STRUCT Y 的 TABLE…ENDTABLE 区块
     blocks = []
     i = 0
@@ -149,35 +222,25 @@ def load_tip(path: str, units_policy: str = "si") -> TipData:
         raise ValueError("No STRUCT Y TABLE found in TIP.")
 
     # 2) 选择 SI 表（units 第二列是 m，第三列是 kg/m）
-    def norm(s: str) -> str:
-        s = s.upper().strip()
-        s = re.sub(r"[^A-Z0-9]", "", s)  # 去非字母数字
-        return s
-
     def parse_block(block):
         hdr_idx, units_idx, data_lines = block
-        hdr = toks(raw[hdr_idx]) if hdr_idx is not None else []
-        units = toks(raw[units_idx]) if units_idx is not None else []
+        hdr = _tokenize(raw[hdr_idx]) if hdr_idx is not None else []
+        units = _tokenize(raw[units_idx]) if units_idx is not None else []
         # 规范化表头：允许 "…ROTAN" 这种含省略号，做包含匹配
-        want = ["SEC","STA","WEIGHT","XCG","ZCG","ROTAPI","JX","JZ","JP",
-                "EA","XNA","ZNA","ROTAN","EJZ","EJX","GJ","XCT","ZCT"]
         idx_map = {}
-        hdr_norm = [norm(h) for h in hdr]
-        for w in want:
+        hdr_norm = [_norm_tip_token(h) for h in hdr]
+        for w in _TIP_COLUMNS:
             for j, h in enumerate(hdr_norm):
                 if w in h:  # 包含匹配
                     idx_map[w] = j
                     break
-        # 解析数据行为二维数组
-        rows = [toks(ln) for ln in data_lines if ln.strip()]
-        rows = [[float(x) for x in r] for r in rows if all(_x.replace(".","",1).replace("-","",1).replace("e","1").replace("E","1").lstrip().replace("+","",1) or True for _x in r)]
-        return idx_map, units, rows
+        return idx_map, units, data_lines
 
     parsed = [parse_block(b) for b in blocks]
 
     # 简单地判断 SI：units 第二个 token 是否包含 'M'（STA 单位），第三个 token 是否包含 'KG/M'
     def is_si(units):
-        u = [norm(x) for x in units]
+        u = [_norm_tip_token(x) for x in units]
         return len(u) >= 3 and ("M" == u[1] or "M" in u[1]) and ("KGM" == u[2] or "KGM" in u[2])
     # 选择最优块：优先 SI，否则第一个
     chosen = None
@@ -188,14 +251,14 @@ def load_tip(path: str, units_policy: str = "si") -> TipData:
     if chosen is None:
         chosen = parsed[0]
 
-    idx_map, units_used, rows = chosen
+    idx_map, units_used, data_lines = chosen
+    # 只解析选中块的数据行为二维数组
+    rows, min_cols = _parse_rows(data_lines)
     # 必要列检查（至少 STA & WEIGHT 要有）
     if "STA" not in idx_map or "WEIGHT" not in idx_map:
         # 尝试按 XV-15 SI 表的固定顺序兜底（SEC, STA, WEIGHT, XCG, ZCG, ROTAPI, JX, JZ, JP, EA, XNA, ZNA, ROTAN, EJZ, EJX, GJ, XCT, ZCT）
-        if rows and all(len(r) >= 18 for r in rows):
-            fixed = ["SEC","STA","WEIGHT","XCG","ZCG","ROTAPI","JX","JZ","JP",
-                     "EA","XNA","ZNA","ROTAN","EJZ","EJX","GJ","XCT","ZCT"]
-            idx_map = {name: i for i, name in enumerate(fixed)}
+        if len(rows) and min_cols >= len(_TIP_COLUMNS):
+            idx_map = {name: i for i, name in enumerate(_TIP_COLUMNS)}
         else:
             raise ValueError("TIP header mapping failed: cannot locate STA/WEIGHT.")
 
@@ -205,7 +268,7 @@ def load_tip(path: str, units_policy: str = "si") -> TipData:
                 return [0.0]*len(rows)
             raise KeyError(f"Missing column '{name}'")
         j = idx_map[name]
-        return [ (r[j] if j < len(r) else 0.0) for r in rows ]
+        return rows[:, j] if j < rows.shape[1] else [0.0]*len(rows)
 
     # 3) 按列名取值（随后做 X/Z→y/z 映射）
     STA   = col("STA")
@@ -220,45 +283,33 @@ def load_tip(path: str, units_policy: str = "si") -> TipData:
     GJ    = col("GJ", True)
     XCT   = col("XCT", True); ZCT = col("ZCT", True)
 
-    # 排序 & 去重（按 STA 升序）
-    import numpy as np
-    STA_arr = np.asarray(STA, dtype=float)
-    order = np.argsort(STA_arr)
-    def reord(v): 
-        a = np.asarray(v, dtype=float)
-        return a[order].tolist()
-    STA   = STA_arr[order].tolist()
-    WEI   = reord(WEI)
-    XCG   = reord(XCG); ZCG = reord(ZCG)
-    ROTAPI= reord(ROTAPI)
-    JX    = reord(JX);  JZ  = reord(JZ); JP = reord(JP)
-    EA    = reord(EA)
-    XNA   = reord(XNA); ZNA = reord(ZNA)
-    ROTAN = reord(ROTAN)
-    EJZ   = reord(EJZ); EJX = reord(EJX)
-    GJ    = reord(GJ)
-    XCT   = reord(XCT); ZCT = reord(ZCT)
-
-    # 4) X/Z → y/z 映射（一次性做完，后续模块只用 y/z 命名）
+    # 4) X/Z → y/z 映射（一次性做完，后续模块只用 y/z 命名），按 TIP_FIELDS 顺序存成一张连续表
+    table = np.array([
+        STA,
+        WEI,            # dM  <- WEIGHT
+        ZCG,            # YCG <- ZCG
+        XCG,            # ZCG <- XCG
+        ROTAPI,
+        ROTAN,
+        JP,             # dJX <- JP
+        JZ,             # dJY <- JZ (X->y)
+        JX,             # dJZ <- JX (X->z)
+        EA,
+        EJX,            # EJY <- EJX
+        EJZ,
+        GJ,
+        ZNA,            # YNA <- ZNA
+        XNA,            # ZNA <- XNA
+        ZCT,            # YCT <- ZCT
+        XCT,            # ZCT <- XCT
+    ], dtype=float)
+    # 按 STA 升序整表重排（一次 gather）
+    table = np.ascontiguousarray(table[:, np.argsort(table[0])])
+    table.flags.writeable = False
     tip = TipData(
-        STA = STA,
-        dM  = WEI,
-        YCG = ZCG,         # from ZCG
-        ZCG = XCG,         # from XCG
-        ROTAPI_deg = ROTAPI,
-        ROTAN_deg  = ROTAN,
-        dJX = JP,          # from JP
-        dJY = JZ,          # from JZ (X->y)
-        dJZ = JX,          # from JX (X->z)
-        EA  = EA,
-        EJY = EJX,         # from EJX
-        EJZ = EJZ,
-        GJ  = GJ,
-        YNA = ZNA,         # from ZNA
-        ZNA = XNA,         # from XNA
-        YCT = ZCT,         # from ZCT
-        ZCT = XCT,         # from XCT
-        meta = {"units_policy": units_policy, "units_row": units_used}
+        **dict(zip(TIP_FIELDS, table)),
+        meta = {"units_policy": units_policy, "units_row": units_used},
+        table = table,
     )
     return tip
 
@@ -271,40 +322,25 @@ def load_aero(path: Optional[str], units_policy: str = "raw") -> Optional[AeroDa
     - Robust header parsing: accepts synonyms and tokens with units/parentheses.
     - Fallback heuristic if header mapping fails: choose most monotonic column as Radial,
       and the most varying other column as Chord.
+    - Re-parsed only when the file's mtime or size changes; callers get their own copy
     """
     if path is None:
         return None
     if not os.path.isfile(path):
         raise FileNotFoundError(f"AERO file not found: {path}")
+    aero = _cached_parse(_AERO_CACHE, path, units_policy, _parse_aero)
+    return copy.deepcopy(aero)
 
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        lines = [ln.strip() for ln in f if ln.strip() and not ln.strip().startswith(("#","!","//"))]
 
+def _parse_aero(path: str, units_policy: str) -> AeroData:
     header_tokens: Optional[List[str]] = None
     numeric_rows: List[List[float]] = []
     warnings: List[str] = []
 
     # ------- helpers (local) -------
-    def _tokenize(s: str) -> List[str]:
-        return s.replace(",", " ").split()
-
-    def _is_numeric_row(tokens: List[str]) -> bool:
-        try:
-            for t in tokens: float(t)
-            return True
-        except: return False
-
-    def _looks_like_units_line(tokens: List[str]) -> bool:
-        text = " ".join(tokens).lower()
-        for k in ["deg","adim","unit","lb","slug","ft","m","kg","**","[]","rad","in","mm","cm"]:
-            if k in text: return True
-        return False
-
     def _norm(tok: str) -> str:
         # uppercase + strip non-alnum, remove trailing units/parentheses etc.
-        t = tok.upper().strip()
-        t = "".join(ch for ch in t if ch.isalnum())
-        return t
+        return _NON_ISALNUM_RE.sub("", tok.upper().strip())
 
     RAD_KEYS = {"RADIAL","R","STA","RADIUS","RAD","STATION","SPAN"}
     CHD_KEYS = {"CHORD","C","CRD","CHRD","CH","CHORDM","CHORDMM","CHORDIN","CHORDLENGTH"}
@@ -312,29 +348,24 @@ def load_aero(path: Optional[str], units_policy: str = "raw") -> Optional[AeroDa
     SWP_KEYS = {"SWEEP"}
     ANH_KEYS = {"ANHEDRAL","DIHEDRAL","ANHD","ANH"}
 
-    # ------- find header (first non-numeric), skip units lines -------
-    i = 0
-    while i < len(lines):
-        toks = _tokenize(lines[i])
-        if not _is_numeric_row(toks):
-            header_tokens = toks
-            j = i + 1
-            while j < len(lines):
-                t2 = _tokenize(lines[j])
-                if _is_numeric_row(t2): break
-                if _looks_like_units_line(t2): j += 1; continue
-                header_tokens += t2
-                j += 1
-            i = j
-            break
-        else:
-            break
-
-    # data rows
-    for k in range(i, len(lines)):
-        toks = _tokenize(lines[k])
-        if _is_numeric_row(toks):
-            numeric_rows.append([float(t) for t in toks])
+    # ------- single streaming pass -------
+    # header = first non-numeric line plus any following non-units lines,
+    # up to the first numeric row; afterwards only numeric rows are kept
+    in_header = True
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for ln in f:
+            ln = ln.strip()
+            if not ln or ln.startswith(("#","!","//")):
+                continue
+            toks = _tokenize(ln)
+            if _is_numeric_row(toks):
+                in_header = False
+                numeric_rows.append([float(t) for t in toks])
+            elif in_header:
+                if header_tokens is None:
+                    header_tokens = toks
+                elif not _looks_like_units_line(toks):
+                    header_tokens += toks
 
     if not numeric_rows:
         raise ValueError("No numeric data rows found in AERO.")
@@ -373,8 +404,6 @@ def load_aero(path: Optional[str], units_policy: str = "raw") -> Optional[AeroDa
         chord_idx = int(max(cand, key=lambda j: vari[j])) if cand else None
         return rad_idx, chord_idx
 
-    import numpy as np
-
     if ("Radial" not in idx_map) or ("Chord" not in idx_map):
         warnings.append("AERO header lacks canonical names; trying heuristic column guess.")
         ridx, cidx = _choose_by_heuristics()
@@ -411,18 +440,6 @@ def load_aero(path: Optional[str], units_policy: str = "raw") -> Optional[AeroDa
         hdr_used = header_tokens
 
     # ------- sort & dedupe by Radial -------
-    def _dedupe_and_sort(x: List[float], data: Dict[str, List[float]]):
-        x_arr = np.asarray(x, dtype=float)
-        order = np.argsort(x_arr)
-        x_sorted = x_arr[order]
-        out = {k: np.asarray(v, dtype=float)[order] for k, v in data.items()}
-        uniq, inv = np.unique(x_sorted, return_inverse=True)
-        res = {k: np.zeros_like(uniq, dtype=float) for k in out}
-        cnt = np.bincount(inv, minlength=len(uniq))
-        for k, arr in out.items():
-            res[k] = np.bincount(inv, weights=arr, minlength=len(uniq)) / np.maximum(cnt, 1)
-        return uniq.tolist(), {k: v.tolist() for k, v in res.items()}
-
     r_sorted, cols_sorted = _dedupe_and_sort(
         Radial,
         {"Chord":Chord, "Twist":Twist, "Sweep":Sweep, "Anhedral":Anhedral}
@@ -1,38 +1,35 @@
 """Multi-rotor blade generator (XML-driven)."""
 
+from __future__ import annotations
+
 import argparse
 import os
+import re
 import sys
-from dataclasses import dataclass
-from typing import Iterable, List, Optional
-
-from aero import write_aero_beam_file, write_aero_refs_file
-from beam import write_beam_file
-from bodies import write_bodies_file
-from gcs import write_gcs_refs
-from grid import BladeGrid, attach_interpolators, build_grid
-from io_blade import AeroData, TipData, load_tip
-from mbd_writer import RotorOut, SimParams, write_main_mbd
-from gen_frameargu import generate as gen_frameargu
-from gen_motor import generate as gen_motor
-from refs_nodes import write_nodes, write_refs
-from rotors_xml import (
-    RotorCfg,
-    build_aerodata_from_rotor_xml,
-    parse_rotors_xml,
-)
-from select_sections import (
-    SectionReport,
-    SectionSelectionConfig,
-    auto_select_sections,
-)
+from collections import Counter
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# The generator modules pull in numpy and the worker pools pull in multiprocessing;
+# they are imported where used so that `main.py --help` and argument errors return
+# without loading them.
+if TYPE_CHECKING:
+    from io_blade import AeroData, TipData
+    from mbd_writer import RotorOut
+    from rotors_xml import RotorCfg
+    from select_sections import SectionReport
+
 # ==== Global switches (temporary; replace with GlobalSettings.xml later) ====
 # aero_mode: "mbdyn" -> generate blade_aero.ref / blade.aerobeam and include them
 #            "coupled" -> skip aerodynamic outputs and excludes from main.mbd
 AERO_MODE = "mbdyn"
 
+# Threads used by _run_single_blade to write one blade's files concurrently
+_WRITER_THREADS = 4
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class GenerationConfig:
     name: str
     out_dir: str
@@ -48,50 +45,62 @@ class GenerationConfig:
     nu: float = 0.33
 
 
+# Defaults every rotor starts from; only name and out_dir differ between rotors
+_DEFAULT_CFG = GenerationConfig(name="", out_dir="")
+
+
+# One character that is neither alphanumeric (str.isalnum, so CJK is kept), "_" nor "-"
+_UNSAFE_NAME_CHAR_RE = re.compile(r"[^\w-]")
+
+
 def _sanitize_name(name: str, fallback: str) -> str:
-    cleaned = "".join(ch if (ch.isalnum() or ch in ("_", "-")) else "_" for ch in name)
-    cleaned = cleaned.strip("_")
+    cleaned = _UNSAFE_NAME_CHAR_RE.sub("_", name).strip("_")
     return cleaned or fallback
 
 
+# Normalised rotor directions that spin CW (blade y mirrored); gcs.write_gcs_refs uses the same rule
+_CW_NAMES = frozenset({"cw", "顺时针"})
+
+
 def _y_sign_from_direction(direction: str) -> float:
     d = (direction or "").strip().lower()
-    if ("顺时" in d) or d == "cw":
-        return -1.0
-    if d == "顺时针":
-        return -1.0
-    return 1.0
+    return -1.0 if d in _CW_NAMES or "顺时" in d else 1.0
+
+
+# blade.report.txt layout: fixed header and parameter block, then one line per section/item
+_REPORT_HEAD = (
+    "# Section selection report\n"
+    "name={cfg.name}\n"
+    "units_tip={cfg.units_tip}, units_aero={cfg.units_aero}\n"
+).format
+_REPORT_PARAMS = (
+    "K={k}, elems={report.elems}, nodes={report.nodes}\n"
+    "r_start_used={report.r_start_used}\n"
+    "params: "
+    "err_tol={cfg.err_tol}, jump_tol={cfg.jump_tol}, max_elems={cfg.max_elems}, "
+    "max_dr={cfg.max_dr}, min_dr={cfg.min_dr}, nu={cfg.nu}, c_eps={cfg.c_eps}\n\n"
+    "Reasons per section:\n"
+).format
+_REPORT_SECTION = "  {:.6f}: {}\n".format
+_REPORT_ITEM = "  - {}\n".format
 
 
 def _write_report(cfg: GenerationConfig, report: SectionReport, extra: Optional[Iterable[str]] = None) -> None:
+    from io_utils import write_parts
+
     out_path = os.path.join(cfg.out_dir, "blade.report.txt")
-    with open(out_path, "w", encoding="utf-8") as fh:
-        fh.write("# Section selection report\n")
-        fh.write(f"name={cfg.name}\n")
-        fh.write(f"units_tip={cfg.units_tip}, units_aero={cfg.units_aero}\n")
-        if extra:
-            for line in extra:
-                fh.write(f"{line}\n")
-        fh.write(
-            f"K={len(report.sections)}, elems={report.elems}, nodes={report.nodes}\n"
-            f"r_start_used={report.r_start_used}\n"
-        )
-        fh.write(
-            "params: "
-            f"err_tol={cfg.err_tol}, jump_tol={cfg.jump_tol}, max_elems={cfg.max_elems}, "
-            f"max_dr={cfg.max_dr}, min_dr={cfg.min_dr}, nu={cfg.nu}, c_eps={cfg.c_eps}\n\n"
-        )
-        fh.write("Reasons per section:\n")
-        for r in report.sections:
-            fh.write(f"  {r:.6f}: {', '.join(report.reasons.get(r, []))}\n")
-        if report.warnings:
-            fh.write("\nWarnings:\n")
-            for w in report.warnings:
-                fh.write(f"  - {w}\n")
-        if report.notes:
-            fh.write("\nNotes:\n")
-            for n in report.notes:
-                fh.write(f"  - {n}\n")
+    parts: List[str] = [_REPORT_HEAD(cfg=cfg)]
+    parts.extend(f"{line}\n" for line in (extra or ()))
+    parts.append(_REPORT_PARAMS(k=len(report.sections), report=report, cfg=cfg))
+    reasons_text = report.reasons_text
+    parts.extend(_REPORT_SECTION(r, reasons_text.get(r, "")) for r in report.sections)
+    if report.warnings:
+        parts.append("\nWarnings:\n")
+        parts.extend(map(_REPORT_ITEM, report.warnings))
+    if report.notes:
+        parts.append("\nNotes:\n")
+        parts.extend(map(_REPORT_ITEM, report.notes))
+    write_parts(parts, out_path)
 
 
 def _run_single_blade(
@@ -100,7 +109,19 @@ def _run_single_blade(
     aero_data: Optional[AeroData],
     y_sign: float,
     extra_report_lines: Optional[Iterable[str]] = None,
-) -> None:
+    aero_mode: str = AERO_MODE,
+) -> bool:
+    """Write all blade files of one rotor into cfg.out_dir; True if blade.aerobeam was written."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from aero import write_aero_beam_file, write_aero_refs_file
+    from beam import write_beam_file
+    from bodies import write_bodies_file
+    from grid import build_blade_grid
+    from io_blade import load_tip
+    from refs_nodes import write_nodes, write_refs
+    from select_sections import SectionSelectionConfig
+
     tip: TipData = load_tip(tip_path, units_policy=cfg.units_tip)
     aero = aero_data
 
@@ -113,26 +134,162 @@ def _run_single_blade(
         min_dr=cfg.min_dr,
         c_eps=cfg.c_eps,
     )
-    sections, report = auto_select_sections(tip, aero, sel_cfg)
+    grid, report = build_blade_grid(tip, aero, sel_cfg)
+
+    # Output directory with its trailing separator, so each file path is one concatenation
+    prefix = os.path.join(cfg.out_dir, "")
+    wrote_aero = aero_mode == "mbdyn" and aero is not None
+    # Each writer owns one output file and only reads tip/grid, so their I/O can overlap.
+    # Submitted longest first (beam, bodies, refs), so no slow writer is left queued behind
+    # the short ones when there are more writers than threads
+    with ThreadPoolExecutor(max_workers=_WRITER_THREADS) as ex:
+        futures = [
+            ex.submit(write_beam_file, tip, grid, cfg.name, cfg.nu, prefix + "blade.beam", y_sign=y_sign),
+            ex.submit(write_bodies_file, tip, grid, cfg.name, prefix + "blade.body"),
+            ex.submit(write_refs, tip, grid, cfg.name, prefix + "blade.ref", y_sign=y_sign),
+        ]
+        if wrote_aero:
+            futures.append(ex.submit(write_aero_beam_file, aero, grid, cfg.name, prefix + "blade.aerobeam"))
+        futures.append(ex.submit(write_nodes, grid, cfg.name, prefix + "blade.nod"))
+        futures.append(ex.submit(_write_report, cfg, report, extra_report_lines))
+        # Coupled mode takes aerodynamics from elsewhere; neither aero file is used
+        if aero_mode == "mbdyn":
+            futures.append(ex.submit(write_aero_refs_file, grid, cfg.name, prefix + "blade_aero.ref"))
+    for fut in futures:
+        fut.result()  # re-raise the first writer error, in submission order
+    return wrote_aero
+
 
-    grid: BladeGrid = build_grid(sections)
-    grid = attach_interpolators(grid, tip, aero)
+def _build_rotor_aero(rotors: Sequence[RotorCfg], aero_mode: str = AERO_MODE) -> List[Optional[AeroData]]:
+    """AeroData of every rotor (None when not needed), built once per distinct XML aero block."""
+    from rotors_xml import build_aerodata_from_rotor_xml
 
-    write_refs(tip, grid, cfg.name, os.path.join(cfg.out_dir, "blade.ref"), y_sign=y_sign)
-    write_nodes(grid, cfg.name, os.path.join(cfg.out_dir, "blade.nod"))
-    write_beam_file(tip, grid, cfg.name, cfg.nu, os.path.join(cfg.out_dir, "blade.beam"), y_sign=y_sign)
-    write_bodies_file(tip, grid, cfg.name, os.path.join(cfg.out_dir, "blade.body"))
-    write_aero_refs_file(grid, cfg.name, os.path.join(cfg.out_dir, "blade_aero.ref"))
-    if AERO_MODE == "mbdyn" and aero is not None:
-        write_aero_beam_file(aero, grid, cfg.name, os.path.join(cfg.out_dir, "blade.aerobeam"))
+    built: Dict[Tuple[Tuple[float, float, float], str], Optional[AeroData]] = {}
+    out: List[Optional[AeroData]] = []
+    for rotor in rotors:
+        aero_data: Optional[AeroData] = None
+        if aero_mode == "mbdyn" and rotor.aero_start_xyz and rotor.aero_data_block:
+            key = (rotor.aero_start_xyz, rotor.aero_data_block)
+            if key not in built:
+                built[key] = build_aerodata_from_rotor_xml(rotor.aero_start_xyz, rotor.aero_data_block)
+            aero_data = built[key]
+        out.append(aero_data)
+    return out
+
+
+def _process_rotor(
+    rotor: RotorCfg,
+    aero_data: Optional[AeroData],
+    out_dir: str,
+    aero_mode: str = AERO_MODE,
+) -> Optional[RotorOut]:
+    """Generate one rotor's blade files under out_dir; None if the rotor is skipped.
 
-    _write_report(cfg, report, extra_report_lines)
+    Top-level and fed only plain data so it can run in a worker process. The rotor
+    directory and aero_data (see _build_rotor_aero) are prepared by _process_rotors().
+    """
+    from mbd_writer import RotorOut
+
+    if not rotor.shape_tip_path:
+        print(f"[WARN] Rotor {rotor.index} '{rotor.name}' missing shape (.tip); skipping.")
+        return None
+
+    rotor_name = _sanitize_name(rotor.name, f"rotor_{rotor.index}")
+    rotor_dir = os.path.join(out_dir, rotor_name)
+
+    cfg = replace(_DEFAULT_CFG, name=rotor_name, out_dir=rotor_dir)
+    y_sign = _y_sign_from_direction(rotor.direction)
+    extra_lines = [
+        f"rotor_index={rotor.index}",
+        f"blade_count={rotor.blade_count}",
+        f"direction={rotor.direction}",
+        f"aero_mode={aero_mode}",
+    ]
+    wrote_aero = _run_single_blade(
+        cfg,
+        rotor.shape_tip_path,
+        aero_data,
+        y_sign,
+        extra_report_lines=extra_lines,
+        aero_mode=aero_mode,
+    )
+
+    has_aero = aero_mode == "mbdyn" and wrote_aero
+    return RotorOut(
+        index=rotor.index,
+        name=rotor_name,
+        out_dir=rotor_dir,
+        blade_count=max(1, rotor.blade_count),
+        has_aero=has_aero,
+    )
+
+
+def _prewarm_shared_tips(rotors: Sequence[RotorCfg], units_policy: str = "si") -> None:
+    """Parse every .tip referenced by more than one rotor once, before workers fork.
+
+    Forked workers inherit load_tip's cache, so identical rotors do not each re-parse
+    the file; tips used by a single rotor are still parsed in parallel by the workers.
+    Spawned workers (the Windows and macOS default) start with an empty cache, so there
+    this would only add serial parsing and is skipped.
+    """
+    import multiprocessing
+
+    if multiprocessing.get_start_method() != "fork":
+        return
+
+    from io_blade import load_tip
+
+    uses = Counter(r.shape_tip_path for r in rotors if r.shape_tip_path)
+    for path, n in uses.items():
+        if n > 1:
+            try:
+                load_tip(path, units_policy=units_policy)
+            except (OSError, KeyError, ValueError):
+                pass  # reported by the rotor's own worker
+
+
+def _process_rotors(rotors: Sequence[RotorCfg], out_dir: str, aero_mode: str = AERO_MODE) -> List[RotorOut]:
+    """Run _process_rotor for every rotor, one worker process per rotor up to the CPU count."""
+    # Create the rotor directories up front from a single listing of out_dir
+    existing = {e.name for e in os.scandir(out_dir) if e.is_dir()}
+    for rotor in rotors:
+        if rotor.shape_tip_path:
+            rotor_name = _sanitize_name(rotor.name, f"rotor_{rotor.index}")
+            if rotor_name not in existing:
+                os.mkdir(os.path.join(out_dir, rotor_name))
+                existing.add(rotor_name)
+
+    aero_datas = _build_rotor_aero(rotors, aero_mode)
+    job = partial(_process_rotor, out_dir=out_dir, aero_mode=aero_mode)
+    # Rotors without a tip only log a skip warning: do that here and size the pool by the real work
+    work = []
+    for rotor, aero_data in zip(rotors, aero_datas):
+        if rotor.shape_tip_path:
+            work.append((rotor, aero_data))
+        else:
+            job(rotor, aero_data)
+    workers = min(len(work), os.cpu_count() or 1)
+    if workers <= 1:
+        results = [job(rotor, aero_data) for rotor, aero_data in work]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Rotors share no state and write into their own directories
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(job, *zip(*work)))
+    return [ro for ro in results if ro is not None]
 
 
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Multi-rotor blade generator (XML-only)")
     parser.add_argument("--rotors-xml", required=True, help="Path to 旋翼.XML")
     parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument(
+        "--aero-mode",
+        choices=("mbdyn", "coupled"),
+        default=AERO_MODE,
+        help="mbdyn: write and include blade aero files; coupled: skip them",
+    )
     return parser.parse_args(argv)
 
 
@@ -140,6 +297,10 @@ def main(argv: Optional[List[str]] = None) -> int:
     args = parse_args(argv)
     os.makedirs(args.out, exist_ok=True)
 
+    from gcs import write_gcs_refs
+    from mbd_writer import SimParams, write_main_mbd
+    from rotors_xml import parse_rotors_xml
+
     try:
         rotors: List[RotorCfg] = parse_rotors_xml(args.rotors_xml)
     except Exception as exc:  # noqa: BLE001 - surface parsing issues to the user
@@ -150,56 +311,26 @@ def main(argv: Optional[List[str]] = None) -> int:
 
     write_gcs_refs(rotors, os.path.join(args.out, "GCS.ref"))
 
-    rotor_outputs: List[RotorOut] = []
-    for rotor in rotors:
-        if not rotor.shape_tip_path:
-            print(f"[WARN] Rotor {rotor.index} '{rotor.name}' missing shape (.tip); skipping.")
-            continue
+    _prewarm_shared_tips(rotors, _DEFAULT_CFG.units_tip)
+    rotor_outputs = _process_rotors(rotors, args.out, args.aero_mode)
 
-        rotor_name = _sanitize_name(rotor.name, f"rotor_{rotor.index}")
-        rotor_dir = os.path.join(args.out, rotor_name)
-        os.makedirs(rotor_dir, exist_ok=True)
+    from gen_frameargu import generate as gen_frameargu
+    from gen_motor import generate as gen_motor
+    from io_utils import Includes
 
-        cfg = GenerationConfig(name=rotor_name, out_dir=rotor_dir)
-        y_sign = _y_sign_from_direction(rotor.direction)
-        aero_data: Optional[AeroData] = None
-        if AERO_MODE == "mbdyn" and rotor.aero_start_xyz and rotor.aero_data_block:
-            aero_data = build_aerodata_from_rotor_xml(rotor.aero_start_xyz, rotor.aero_data_block)
-        extra_lines = [
-            f"rotor_index={rotor.index}",
-            f"blade_count={rotor.blade_count}",
-            f"direction={rotor.direction}",
-            f"aero_mode={AERO_MODE}",
-        ]
-        _run_single_blade(
-            cfg,
-            rotor.shape_tip_path,
-            aero_data,
-            y_sign,
-            extra_report_lines=extra_lines,
-        )
-
-        has_aero = (
-            AERO_MODE == "mbdyn"
-            and os.path.isfile(os.path.join(rotor_dir, "blade.aerobeam"))
-        )
-        rotor_outputs.append(
-            RotorOut(
-                index=rotor.index,
-                name=rotor_name,
-                out_dir=rotor_dir,
-                blade_count=max(1, rotor.blade_count),
-                has_aero=has_aero,
-            )
-        )
+    # Airframe and motor inputs sit next to the rotors XML; absent files add nothing
+    xml_dir = os.path.dirname(os.path.abspath(args.rotors_xml))
+    includes = Includes()
+    gen_frameargu(os.path.join(xml_dir, "aer_frameargu.xml"), args.out, includes)
+    gen_motor(os.path.join(xml_dir, "act_motor.xml"), args.out, includes)
 
     write_main_mbd(
         project_out_dir=args.out,
         rotor_outputs=rotor_outputs,
         sim=SimParams(),
-        include_aero=(AERO_MODE == "mbdyn"),
-        extra_node_includes=extra_node_includes,
-        extra_element_includes=extra_element_includes,
+        include_aero=(args.aero_mode == "mbdyn"),
+        extra_node_includes=includes.node,
+        extra_element_includes=includes.element,
     )
     print(f"Done. Outputs in: {args.out}")
     return 0
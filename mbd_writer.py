@@ -1,37 +1,70 @@
 """Helpers to assemble the project-level main.mbd input file."""
 
+import mmap
 import os
+import re
+import stat
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Sequence, TextIO, Tuple
 
 
-def _fe(x: float) -> str:
+@lru_cache(maxsize=4096)
+def _fe_cached(x: float) -> str:
     return f"{x:.6e}"
 
 
+def _fe(x: float) -> str:
+    # 0.0 and -0.0 share a cache key but format differently, so zeros bypass the cache
+    if x == 0.0:
+        return f"{x:.6e}"
+    return _fe_cached(x)
+
+
+@lru_cache(maxsize=4096)
+def _path_rel_abs(from_dir: str, to_path: str) -> str:
+    return os.path.normpath(os.path.relpath(to_path, start=from_dir)).replace("\\", "/")
+
+
 def _path_rel(from_dir: str, to_path: str) -> str:
+    """Normalised relpath with forward slashes; memoised when the result cannot depend on the cwd."""
+    if os.path.isabs(from_dir) and os.path.isabs(to_path):
+        return _path_rel_abs(from_dir, to_path)
     return os.path.normpath(os.path.relpath(to_path, start=from_dir)).replace("\\", "/")
 
 
-def _safe_exists(path: str) -> bool:
+@lru_cache(maxsize=None)
+def _token_line_re(token: str) -> "re.Pattern[bytes]":
+    # At most one match per line: from a line start (after \n, \r or \r\n, as text-mode
+    # universal newlines split), lazily up to the first occurrence of the token
+    return re.compile(rb"(?:^|(?<=\r))[^\r\n]*?" + re.escape(token.encode("utf-8")), re.MULTILINE)
+
+
+def _count_tokens_bulk(path: str, tokens: Sequence[str]) -> Dict[str, int]:
+    """Number of lines of *path* containing each token (0 if the file is missing), from one mapping."""
+    tokens = tuple(tokens)
     try:
-        return os.path.isfile(path)
-    except Exception:
-        return False
+        st = os.stat(path)
+    except OSError:
+        return dict.fromkeys(tokens, 0)
+    if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+        return dict.fromkeys(tokens, 0)
+    counts = dict.fromkeys(tokens, 0)
+    # A token longer than the whole file cannot occur in it; open the file only if one fits
+    fits = [t for t in tokens if len(t.encode("utf-8")) <= st.st_size]
+    if fits:
+        # Scan the mapped pages in place: no read copy and no decoding
+        with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for t in fits:
+                counts[t] = sum(1 for _ in _token_line_re(t).finditer(mm))
+    return counts
 
 
 def _count_token_lines(path: str, token: str) -> int:
-    if not _safe_exists(path):
-        return 0
-    count = 0
-    with open(path, "r", encoding="utf-8", errors="ignore") as fh:
-        for line in fh:
-            if token in line:
-                count += 1
-    return count
+    return _count_tokens_bulk(path, (token,))[token]
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RotorOut:
     """Per-rotor output metadata needed to assemble the main file."""
 
@@ -42,7 +75,7 @@ class RotorOut:
     has_aero: bool
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SimParams:
     """Simulation controls for the initial value block."""
 
@@ -73,22 +106,36 @@ class ControlVars:
     num_joints_blade_yoke: int = 0
 
 
-def _scan_blade_counts(rotor_dirs: List[RotorOut]) -> ControlVars:
+def _rotor_file_set(out_dir: str) -> FrozenSet[str]:
+    """Names of the regular files in *out_dir* (empty if it cannot be listed), from one scandir."""
+    try:
+        with os.scandir(out_dir) as it:
+            return frozenset(e.name for e in it if e.is_file())
+    except OSError:
+        return frozenset()
+
+
+def _scan_blade_counts(
+    rotor_dirs: List[RotorOut],
+    file_sets: Optional[Dict[str, FrozenSet[str]]] = None,
+    include_aero: bool = True,
+) -> ControlVars:
     n_nodes = 0
     n_bodies = 0
     n_beams = 0
     n_aero = 0
+    # Every blade copy of a rotor shares its files: scan once, multiply by the copy count
     for rotor in rotor_dirs:
-        count = getattr(rotor, "blade_count", 1) or 1
-        path_nod = os.path.join(rotor.out_dir, "blade.nod")
-        path_beam = os.path.join(rotor.out_dir, "blade.beam")
-        path_body = os.path.join(rotor.out_dir, "blade.body")
-        path_aero = os.path.join(rotor.out_dir, "blade.aerobeam")
-
-        n_nodes += _count_token_lines(path_nod, "structural:") * count
-        n_bodies += _count_token_lines(path_body, "body:") * count
-        n_beams += _count_token_lines(path_beam, "beam3:") * count
-        n_aero += _count_token_lines(path_aero, "aerodynamic beam3:") * count
+        count = max(1, rotor.blade_count)
+        files = file_sets[rotor.out_dir] if file_sets is not None else _rotor_file_set(rotor.out_dir)
+        if "blade.nod" in files:
+            n_nodes += _count_token_lines(os.path.join(rotor.out_dir, "blade.nod"), "structural:") * count
+        if "blade.body" in files:
+            n_bodies += _count_token_lines(os.path.join(rotor.out_dir, "blade.body"), "body:") * count
+        if "blade.beam" in files:
+            n_beams += _count_token_lines(os.path.join(rotor.out_dir, "blade.beam"), "beam3:") * count
+        if include_aero and "blade.aerobeam" in files:
+            n_aero += _count_token_lines(os.path.join(rotor.out_dir, "blade.aerobeam"), "aerodynamic beam3:") * count
 
     return ControlVars(
         num_blade_nodes=n_nodes,
@@ -98,6 +145,89 @@ def _scan_blade_counts(rotor_dirs: List[RotorOut]) -> ControlVars:
     )
 
 
+def _write_extra(fh: TextIO, extra_lines: List[str]) -> None:
+    """Caller-supplied lines (trailing whitespace stripped) followed by a blank line."""
+    for ln in extra_lines:
+        fh.write(ln.rstrip())
+        fh.write("\n")
+    fh.write("\n")
+
+
+# Data, initial value and control data sections of main.mbd, filled from SimParams and ControlVars fields
+_HEADER_TMPL = (
+    "begin: data;\n"
+    "    problem: initial value;\n"
+    "end: data;\n"
+    "\n"
+    "begin: initial value;\n"
+    "    time step: {time_step};\n"
+    "    initial time: {t0:.6f};\n"
+    "    final time: {t_end:.6f} ;\n"
+    "    max iterations: {max_iters};\n"
+    "    tolerance: {tol};\n"
+    "    derivatives tolerance: {deriv_tol};\n"
+    "    derivatives max iterations: {deriv_max_iters};\n"
+    "    derivatives coefficient: {deriv_coeff};\n"
+    "    linear solver: {linear_solver};\n"
+    "    method: {method};\n"
+    "    #output: residual;\n"
+    "    output: counter;\n"
+    "    /*\n"
+    "    eigenanalysis: 0.10000,\n"
+    "        output matrices,\n"
+    "        output eigenvectors,\n"
+    "        output geometry,\n"
+    "        upper frequency limit, 400,\n"
+    "        lower frequency limit, 1,\n"
+    "        use lapack;*/\n"
+    "end: initial value;\n"
+    "\n"
+    "# CONTROL DATA SECTION\n"
+    "begin: control data;\n"
+    "set: const integer num_blade        = {num_blade_nodes};\n"
+    "set: const integer num_blade_dynamic= {num_blade_bodies};\n"
+    "set: const integer num_beam         = {num_beam};\n"
+    "set: const integer num_aerobeam     = {num_aerobeam};\n"
+    "set: const integer num_rotor        = {num_rotor_static_nodes};\n"
+    "set: const integer num_rotor_dynamic= {num_rotor_dynamic_bodies};\n"
+    "set: const integer num_force        = {num_force};\n"
+    "set: const integer num_joint_rotor  = {num_joints_rotor};\n"
+    "set: const integer num_joint_by     = {num_joints_blade_yoke};\n"
+    "\n"
+    "    structural nodes:\n"
+    "        num_blade +\n"
+    "        num_rotor\n"
+    "        ;\n"
+    "    rigid bodies:\n"
+    "        num_blade_dynamic +\n"
+    "        num_rotor_dynamic\n"
+    "        ;\n"
+    "    aerodynamic elements:\n"
+    "        num_aerobeam\n"
+    "        ;\n"
+    "    forces: num_force;\n"
+    "\n"
+    "    beams:\n"
+    "        num_beam +\n"
+    "        ;\n"
+    "    joints:\n"
+    "        num_blade +\n"
+    "        num_rotor\n"
+    "        ;\n"
+    "    inertia: 1;\n"
+    "    air properties;\n"
+    "    gravity;\n"
+    "    induced velocity elements:+1\n"
+    "    ;\n"
+    "    output results: netcdf;\n"
+    "    default output: reference frames;\n"
+    "    default orientation: orientation vector;\n"
+    "    print: equation description;\n"
+    "end: control data;\n"
+    "\n"
+)
+
+
 def write_main_mbd(
     project_out_dir: str,
     rotor_outputs: List[RotorOut],
@@ -117,180 +247,113 @@ def write_main_mbd(
     os.makedirs(project_out_dir, exist_ok=True)
     sim = sim or SimParams()
 
-    expanded: List[RotorOut] = []
-    for rotor in rotor_outputs:
-        for _ in range(max(1, rotor.blade_count)):
-            expanded.append(RotorOut(rotor.index, rotor.name, rotor.out_dir, 1, rotor.has_aero))
-    ctrl = _scan_blade_counts(expanded)
-    if not include_aero:
-        ctrl.num_aerobeam = 0
+    # One directory listing per rotor answers every existence check below
+    file_sets = {rotor.out_dir: _rotor_file_set(rotor.out_dir) for rotor in rotor_outputs}
+    ctrl = _scan_blade_counts(rotor_outputs, file_sets, include_aero)
     if ctrl_override:
         for key, value in ctrl_override.items():
             if hasattr(ctrl, key):
                 setattr(ctrl, key, int(value))
 
-    lines: List[str] = []
-    lines += [
-        "begin: data;",
-        "    problem: initial value;",
-        "end: data;",
-        "",
-    ]
-
-    lines += [
-        "begin: initial value;",
-        f"    time step: {_fe(sim.time_step)};",
-        f"    initial time: {sim.t0:.6f};",
-        f"    final time: {sim.t_end:.6f} ;",
-        f"    max iterations: {sim.max_iters};",
-        f"    tolerance: {_fe(sim.tol)};",
-        f"    derivatives tolerance: {_fe(sim.deriv_tol)};",
-        f"    derivatives max iterations: {sim.deriv_max_iters};",
-        f"    derivatives coefficient: {_fe(sim.deriv_coeff)};",
-        f"    linear solver: {sim.linear_solver};",
-        f"    method: {sim.method};",
-        "    #output: residual;",
-        "    output: counter;",
-        "    /*",
-        "    eigenanalysis: 0.10000,",
-        "        output matrices,",
-        "        output eigenvectors,",
-        "        output geometry,",
-        "        upper frequency limit, 400,",
-        "        lower frequency limit, 1,",
-        "        use lapack;*/",
-        "end: initial value;",
-        "",
-    ]
-
-    lines += [
-        "# CONTROL DATA SECTION",
-        "begin: control data;",
-        f"set: const integer num_blade        = {ctrl.num_blade_nodes};",
-        f"set: const integer num_blade_dynamic= {ctrl.num_blade_bodies};",
-        f"set: const integer num_beam         = {ctrl.num_beam};",
-        f"set: const integer num_aerobeam     = {ctrl.num_aerobeam};",
-        f"set: const integer num_rotor        = {ctrl.num_rotor_static_nodes};",
-        f"set: const integer num_rotor_dynamic= {ctrl.num_rotor_dynamic_bodies};",
-        f"set: const integer num_force        = {ctrl.num_force};",
-        f"set: const integer num_joint_rotor  = {ctrl.num_joints_rotor};",
-        f"set: const integer num_joint_by     = {ctrl.num_joints_blade_yoke};",
-        "",
-        "    structural nodes:",
-        "        num_blade +",
-        "        num_rotor",
-        "        ;",
-        "    rigid bodies:",
-        "        num_blade_dynamic +",
-        "        num_rotor_dynamic",
-        "        ;",
-        "    aerodynamic elements:",
-        "        num_aerobeam",
-        "        ;",
-        "    forces: num_force;",
-        "",
-        "    beams:",
-        "        num_beam +",
-        "        ;",
-        "    joints:",
-        "        num_blade +",
-        "        num_rotor",
-        "        ;",
-        "    inertia: 1;",
-        "    air properties;",
-        "    gravity;",
-        "    induced velocity elements:+1",
-        "    ;",
-        "    output results: netcdf;",
-        "    default output: reference frames;",
-        "    default orientation: orientation vector;",
-        "    print: equation description;",
-        "end: control data;",
-        "",
-    ]
-
-    if c81_pairs:
-        for name, rel in c81_pairs:
-            lines.append(f'c81 data: {name}, "{rel}";')
-        lines.append("")
-
-    lines += [
-        "set: const integer CURR_ROTOR = 0;",
-        "set: const integer CURR_blade = 0;",
-        "",
-        '# Reference frame',
-        'include: "GCS.ref";',
-        "",
-        "# Blades (refs for each blade copy)",
-    ]
-
-    for rotor in rotor_outputs:
-        rotor_base = rotor.index * 100000
-        rel_ref = _path_rel(project_out_dir, os.path.join(rotor.out_dir, "blade.ref"))
-        for blade_idx in range(1, max(1, rotor.blade_count) + 1):
-            blade_base = blade_idx * 10000
-            lines.append(f"set: CURR_ROTOR = {rotor_base};")
-            lines.append(f"set: CURR_blade = {blade_base};")
-            lines.append(f'include: "{rel_ref}";')
-
-    if extra_includes_before_nodes:
-        lines += [ln.rstrip() for ln in extra_includes_before_nodes]
-        lines.append("")
-
-    lines += ["", "begin: nodes;", ""]
-
-    if extra_node_includes:
-        lines += [ln.rstrip() for ln in extra_node_includes]
-        lines.append("")
-
-    for rotor in rotor_outputs:
-        rotor_base = rotor.index * 100000
-        rel_nod = _path_rel(project_out_dir, os.path.join(rotor.out_dir, "blade.nod"))
-        for blade_idx in range(1, max(1, rotor.blade_count) + 1):
-            blade_base = blade_idx * 10000
-            lines.append(f"    set: CURR_ROTOR = {rotor_base};")
-            lines.append(f"    set: CURR_blade = {blade_base};")
-            lines.append(f'    include: "{rel_nod}";')
-        lines.append("")
-
-    lines += ["end: nodes;", "", "begin: elements;", ""]
-
+    # Include paths of every rotor, resolved once for the refs, nodes and elements blocks
+    rotor_rels: List[Tuple[str, str, str, str, Optional[str]]] = []
     for rotor in rotor_outputs:
-        rotor_base = rotor.index * 100000
-        rel_beam = _path_rel(project_out_dir, os.path.join(rotor.out_dir, "blade.beam"))
-        rel_body = _path_rel(project_out_dir, os.path.join(rotor.out_dir, "blade.body"))
         path_aero = os.path.join(rotor.out_dir, "blade.aerobeam")
-        rel_aero = _path_rel(project_out_dir, path_aero)
-        has_aero = include_aero and _safe_exists(path_aero)
-        lines.append(f"    # --- {rotor.name} ---")
-        for blade_idx in range(1, max(1, rotor.blade_count) + 1):
-            blade_base = blade_idx * 10000
-            lines.append(f"    set: CURR_ROTOR = {rotor_base};")
-            lines.append(f"    set: CURR_blade = {blade_base};")
-            lines.append(f'    include: "{rel_beam}";')
-            lines.append(f'    include: "{rel_body}";')
-            if has_aero:
-                lines.append(f'    include: "{rel_aero}";')
-        lines.append("")
-
-    lines += [
-        "    air properties: 1.225, 340.0,",
-        "        -1., 0., 0., const,0;",
-        "        #cosine, 15., pi/10, WIND_SPEED/2, half, 0.;",
-        "",
-    ]
-
-    if extra_element_includes:
-        lines += [ln.rstrip() for ln in extra_element_includes]
-        lines.append("")
-
-    if extra_elements_lines:
-        lines += [ln.rstrip() for ln in extra_elements_lines]
-        lines.append("")
-
-    lines += ["end: elements;", ""]
-
+        has_aero = include_aero and "blade.aerobeam" in file_sets[rotor.out_dir]
+        rotor_rels.append((
+            _path_rel(project_out_dir, os.path.join(rotor.out_dir, "blade.ref")),
+            _path_rel(project_out_dir, os.path.join(rotor.out_dir, "blade.nod")),
+            _path_rel(project_out_dir, os.path.join(rotor.out_dir, "blade.beam")),
+            _path_rel(project_out_dir, os.path.join(rotor.out_dir, "blade.body")),
+            _path_rel(project_out_dir, path_aero) if has_aero else None,
+        ))
+
+    # "set: CURR_ROTOR / CURR_blade" prologue of every blade copy, built once: as-is for the
+    # refs block and indented for the nodes and elements blocks
+    prologues: List[List[str]] = []
+    for rotor in rotor_outputs:
+        set_rotor = f"set: CURR_ROTOR = {rotor.index * 100000};\n"
+        prologues.append([
+            f"{set_rotor}set: CURR_blade = {blade_idx * 10000};\n"
+            for blade_idx in range(1, max(1, rotor.blade_count) + 1)
+        ])
+    prologues_ind = [["    " + p.replace("\n", "\n    ", 1) for p in pro] for pro in prologues]
+
+    params = {
+        "time_step": _fe(sim.time_step),
+        "t0": sim.t0,
+        "t_end": sim.t_end,
+        "max_iters": sim.max_iters,
+        "tol": _fe(sim.tol),
+        "deriv_tol": _fe(sim.deriv_tol),
+        "deriv_max_iters": sim.deriv_max_iters,
+        "deriv_coeff": _fe(sim.deriv_coeff),
+        "linear_solver": sim.linear_solver,
+        "method": sim.method,
+    }
+    params.update(vars(ctrl))
+
+    # Stream the sections straight into a large write buffer instead of assembling the whole file first
     out_path = os.path.join(project_out_dir, "main.mbd")
-    with open(out_path, "w", encoding="utf-8") as fh:
-        fh.write("\n".join(lines))
+    with open(out_path, "w", encoding="utf-8", buffering=1 << 20) as fh:
+        w = fh.write
+        w(_HEADER_TMPL.format_map(params))
+
+        if c81_pairs:
+            for name, rel in c81_pairs:
+                w(f'c81 data: {name}, "{rel}";\n')
+            w("\n")
+
+        w(
+            "set: const integer CURR_ROTOR = 0;\n"
+            "set: const integer CURR_blade = 0;\n"
+            "\n"
+            "# Reference frame\n"
+            'include: "GCS.ref";\n'
+            "\n"
+            "# Blades (refs for each blade copy)\n"
+        )
+
+        for pro, (rel_ref, _, _, _, _) in zip(prologues, rotor_rels):
+            include = f'include: "{rel_ref}";\n'
+            w("".join(p + include for p in pro))
+
+        if extra_includes_before_nodes:
+            _write_extra(fh, extra_includes_before_nodes)
+
+        w("\nbegin: nodes;\n\n")
+
+        if extra_node_includes:
+            _write_extra(fh, extra_node_includes)
+
+        for pro, (_, rel_nod, _, _, _) in zip(prologues_ind, rotor_rels):
+            include = f'    include: "{rel_nod}";\n'
+            w("".join(p + include for p in pro))
+            w("\n")
+
+        w("end: nodes;\n\nbegin: elements;\n\n")
+
+        for rotor, pro, (_, _, rel_beam, rel_body, rel_aero) in zip(rotor_outputs, prologues_ind, rotor_rels):
+            include = f'    include: "{rel_beam}";\n    include: "{rel_body}";\n'
+            if rel_aero is not None:
+                include += f'    include: "{rel_aero}";\n'
+            w(f"    # --- {rotor.name} ---\n")
+            w("".join(p + include for p in pro))
+            w("\n")
+
+        w(
+            "    air properties: 1.225, 340.0,\n"
+            "        -1., 0., 0., const,0;\n"
+            "        #cosine, 15., pi/10, WIND_SPEED/2, half, 0.;\n"
+            "\n"
+        )
+
+        if extra_element_includes:
+            _write_extra(fh, extra_element_includes)
+
+        if extra_elements_lines:
+            _write_extra(fh, extra_elements_lines)
+
+        w("end: elements;\n")
+
     return out_path
@@ -2,54 +2,87 @@
 """Utilities to write blade reference frames and structural nodes."""
 
 import math
+from typing import BinaryIO, List, Optional
+
 from io_blade import TipData
 from grid import BladeGrid
+from io_utils import write_parts
+
+
+_DEG2RAD = math.pi / 180.0  # the factor math.radians multiplies by
+
+# Closing lines shared by every frame and node card: null velocity and angular velocity in *ref*
+def _null_tail(ref: str) -> str:
+    return f"    reference, {ref}, null,\n    reference, {ref}, null;\n\n"
+
+
+_BASE = "CURR_ROTOR + BASE"
+_FEATH = "CURR_ROTOR + CURR_blade + FEATH + %d"
+_NEUTR = "CURR_ROTOR + CURR_blade + NEUTR + %d"
+
+# NEUTR and BODY frames only differ in their label and offsets
+_FEATH_CHILD_FMT = (
+    "    reference, " + _FEATH + ", 0., %.10f, %.10f,\n"
+    "    reference, " + _FEATH + ", eye,\n"
+    + _null_tail(_FEATH)
+)
+
+# FEATH, NEUTR and BODY reference frames of one node. A %-template: str.format with
+# reused {0} fields measured about twice as slow on these blocks
+_REF_NODE_FMT = (
+    "reference: CURR_ROTOR + CURR_blade + FEATH + %d, #gen ref\n"
+    "    reference, " + _BASE + ", %.10f, 0., 0.,\n"
+    "    reference, " + _BASE + ",\n"
+    "        1, 1., 0., 0.,\n"
+    "        2, 0., %.10f, %.10f,\n"
+    + _null_tail(_BASE)
+    + "reference: CURR_ROTOR + CURR_blade + NEUTR + %d, #gen ref\n"
+    + _FEATH_CHILD_FMT
+    + "reference: CURR_ROTOR + CURR_blade + BODY + %d, #gen ref\n"
+    + _FEATH_CHILD_FMT
+)
+
+# Dynamic structural node placed on its NEUTR reference (node index five times)
+_STRUCT_NODE_FMT = (
+    "structural:  CURR_ROTOR + CURR_blade + %d, dynamic,\n"
+    "    reference, " + _NEUTR + ", null,\n"
+    "    reference, " + _NEUTR + ", eye,\n"
+    + _null_tail(_NEUTR)
+)
+
+
+def write_refs(
+    tip: TipData, grid: BladeGrid, name: str, out_path: str, y_sign: float = 1.0, *, out: Optional[BinaryIO] = None
+) -> None:
+    if grid.interp_tip_many is None:
+        raise RuntimeError("attach_interpolators() first.")
+
+    # All fields at every node in one batched call
+    ROTAPI, YNA, ZNA, YCG, ZCG = grid.interp_tip_many(
+        ("ROTAPI_deg", "YNA", "ZNA", "YCG", "ZCG"), grid.nodes_arr
+    )
+    rows = zip(
+        grid.nodes, (ROTAPI * _DEG2RAD).tolist(),
+        (y_sign * YNA).tolist(), ZNA.tolist(),
+        (y_sign * YCG).tolist(), ZCG.tolist(),
+    )
+
+    parts: List[str] = ["# blade.ref\n", f"# name={name}\n"]
+    # cos/sin stay scalar libm calls: np.cos/np.sin need not round identically, and
+    # cmath.rect(1.0, t) gives the same pair but is slower than the two calls
+    parts += [
+        _REF_NODE_FMT % (
+            i, x, math.cos(twist), math.sin(twist),
+            i, i, yna, zna, i, i, i,
+            i, i, ycg, zcg, i, i, i,
+        )
+        for i, (x, twist, yna, zna, ycg, zcg) in enumerate(rows, start=1)
+    ]
+
+    write_parts(parts, out_path, out)
 
 
-def _f(val: float) -> str:
-    return f"{val:.10f}"
-
-
-def write_refs(tip: TipData, grid: BladeGrid, name: str, out_path: str, y_sign: float = 1.0) -> None:
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("# blade.ref\n")
-        f.write(f"# name={name}\n")
-        for i, x in enumerate(grid.nodes, start=1):
-            twist_deg = grid.interp_tip("ROTAPI_deg", x)
-            c = math.cos(math.radians(twist_deg)); s = math.sin(math.radians(twist_deg))
-
-            f.write(f"reference: CURR_ROTOR + CURR_blade + FEATH + {i}, #gen ref\n")
-            f.write(f"    reference, CURR_ROTOR + BASE, {_f(x)}, 0., 0.,\n")
-            f.write("    reference, CURR_ROTOR + BASE,\n")
-            f.write("        1, 1., 0., 0.,\n")
-            f.write(f"        2, 0., {_f(c)}, {_f(s)},\n")
-            f.write("    reference, CURR_ROTOR + BASE, null,\n")
-            f.write("    reference, CURR_ROTOR + BASE, null;\n\n")
-
-            YNA = y_sign * grid.interp_tip("YNA", x)
-            ZNA = grid.interp_tip("ZNA", x)
-            f.write(f"reference: CURR_ROTOR + CURR_blade + NEUTR + {i}, #gen ref\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, 0., {_f(YNA)}, {_f(ZNA)},\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, eye,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, null,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, null;\n\n")
-
-            YCG = y_sign * grid.interp_tip("YCG", x)
-            ZCG = grid.interp_tip("ZCG", x)
-            f.write(f"reference: CURR_ROTOR + CURR_blade + BODY + {i}, #gen ref\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, 0., {_f(YCG)}, {_f(ZCG)},\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, eye,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, null,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + FEATH + {i}, null;\n\n")
-
-
-def write_nodes(grid: BladeGrid, name: str, out_path: str) -> None:
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write("# blade.nod\n")
-        f.write(f"# name={name}\n")
-        for i, _x in enumerate(grid.nodes, start=1):
-            f.write(f"structural:  CURR_ROTOR + CURR_blade + {i}, dynamic,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + NEUTR + {i}, null,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + NEUTR + {i}, eye,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + NEUTR + {i}, null,\n")
-            f.write(f"    reference, CURR_ROTOR + CURR_blade + NEUTR + {i}, null;\n\n")
+def write_nodes(grid: BladeGrid, name: str, out_path: str, *, out: Optional[BinaryIO] = None) -> None:
+    parts: List[str] = ["# blade.nod\n", f"# name={name}\n"]
+    parts += [_STRUCT_NODE_FMT % ((i,) * 5) for i in range(1, len(grid.nodes) + 1)]
+    write_parts(parts, out_path, out)
@@ -1,13 +1,23 @@
 # rotors_xml.py
 """Parsers for multi-rotor XML inputs."""
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
-import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import io
 import os
 import re
 
+try:  # libxml2-backed parser when available; same find/findtext API as ElementTree
+    from lxml import etree as ET
+    _HAS_LXML = True
+except ImportError:  # pragma: no cover - depends on the environment
+    import xml.etree.ElementTree as ET
+    _HAS_LXML = False
+
 from io_blade import AeroData
 
+_XML_ERRORS: Tuple[type, ...] = (ET.XMLSyntaxError,) if _HAS_LXML else (ET.ParseError,)
+
 
 @dataclass
 class RotorCfg:
@@ -30,10 +40,20 @@ class VehicleCfg:
     raw_path: Optional[str] = None
 
 
+# <形状系数>path<形状系数> written with an opening tag where the closing one belongs
+_MALFORMED_SHAPE_RE = re.compile(r"<形状系数>([^<]+)<形状系数>")
+# Drive-letter prefix of a Windows absolute path (C:\ or C:/)
+_WIN_DRIVE_RE = re.compile(r"[A-Za-z]:[\\/]")
+# Full-width separators of the aero CSV block folded onto their ASCII forms
+_CSV_TRANS = str.maketrans({"，": ",", "；": ";"})
+# Padding that gives every aero CSV row at least nine columns
+_NINE_BLANKS = ("",) * 9
+
+
 def _fix_malformed_tags(xml_text: str) -> str:
     """Fix known malformed tags in the provided XML text."""
 
-    return re.sub(r"<形状系数>([^<]+)<形状系数>", r"<形状系数>\1</形状系数>", xml_text)
+    return _MALFORMED_SHAPE_RE.sub(r"<形状系数>\1</形状系数>", xml_text)
 
 
 def _looks_windows_absolute(path: str) -> bool:
@@ -43,16 +63,21 @@ def _looks_windows_absolute(path: str) -> bool:
         return False
     if path.startswith("\\\\") or path.startswith("//"):
         return True
-    return bool(re.match(r"^[A-Za-z]:[\\/].*", path))
+    return _WIN_DRIVE_RE.match(path) is not None
 
 
-def _resolve_tip_path(xml_path: str, raw_path: Optional[str]) -> Optional[str]:
-    """Resolve a tip path, handling relative paths and Windows absolutes."""
+def _resolve_tip_path(xml_path: str, raw_path: Optional[str], xml_dir: Optional[str] = None) -> Optional[str]:
+    """Resolve a tip path, handling relative paths and Windows absolutes.
+
+    *xml_dir* is the absolute directory of *xml_path*; callers resolving many paths
+    from one file pass it in so it is computed once.
+    """
 
     if not raw_path:
         return None
 
-    xml_dir = os.path.dirname(os.path.abspath(xml_path))
+    if xml_dir is None:
+        xml_dir = os.path.dirname(os.path.abspath(xml_path))
     candidate = raw_path.strip()
     candidate = candidate.replace("\\", os.sep)
 
@@ -76,10 +101,12 @@ def _resolve_tip_path(xml_path: str, raw_path: Optional[str]) -> Optional[str]:
     return os.path.abspath(candidate)
 
 
-def _get_text(elem: Optional[ET.Element]) -> str:
+def _get_text(elem) -> str:
     return (elem.text or "").strip() if elem is not None else ""
 
 
+# Rotors of one file often repeat the same centre/attitude text; results are immutable tuples
+@lru_cache(maxsize=256)
 def _to_floats_csv(value: str) -> Tuple[float, float, float]:
     parts = [p.strip() for p in value.replace("，", ",").split(",") if p.strip()]
     vals = [float(parts[i]) if i < len(parts) else 0.0 for i in range(3)]
@@ -98,6 +125,9 @@ class AeroSeg:
     div_type: Optional[str]
 
 
+# Aero CSV columns repeat heavily (blank cells, shared sweep/anhedral); a hit also skips the
+# exception raised for every blank cell
+@lru_cache(maxsize=256)
 def _parse_float_safe(value: str, default: float = 0.0) -> float:
     try:
         return float(value)
@@ -108,26 +138,26 @@ def _parse_float_safe(value: str, default: float = 0.0) -> float:
 def parse_aero_segments(csv_block: str) -> List[AeroSeg]:
     """Parse the aero CSV block from the XML into segments."""
 
-    text = (csv_block or "").strip()
+    text = (csv_block or "").strip().translate(_CSV_TRANS)
     if not text:
         return []
 
-    rows = re.split(r"[;；]\s*", text)
     segments: List[AeroSeg] = []
-    for row in rows:
-        if not row:
+    for row in text.split(";"):
+        if not row or row.isspace():
             continue
-        cols = [c.strip() for c in row.replace("，", ",").split(",")]
-        while len(cols) < 9:
-            cols.append("")
-        chord = _parse_float_safe(cols[1])
-        twist = _parse_float_safe(cols[2])
-        c81 = cols[3] or None
-        dr = float(cols[4]) if cols[4] else None
-        sweep = _parse_float_safe(cols[5])
-        anhedral = _parse_float_safe(cols[6])
-        divs = int(float(cols[7])) if cols[7] else None
-        div_type = cols[8] or None
+        # Missing trailing columns read as "", extra ones are ignored
+        _, chord_s, twist_s, c81_s, dr_s, sweep_s, anhedral_s, divs_s, div_type_s, *_ = (
+            *[c.strip() for c in row.split(",")], *_NINE_BLANKS
+        )
+        chord = _parse_float_safe(chord_s)
+        twist = _parse_float_safe(twist_s)
+        c81 = c81_s or None
+        dr = float(dr_s) if dr_s else None
+        sweep = _parse_float_safe(sweep_s)
+        anhedral = _parse_float_safe(anhedral_s)
+        divs = int(float(divs_s)) if divs_s else None
+        div_type = div_type_s or None
         segments.append(AeroSeg(chord, twist, c81, dr, sweep, anhedral, divs, div_type))
 
     return segments
@@ -180,71 +210,155 @@ def build_aerodata_from_rotor_xml(
     )
 
 
+def _compile_find(path: str) -> Callable[[Any], Any]:
+    """``elem.find(path)`` as a reusable callable; a precompiled XPath under lxml."""
+    if _HAS_LXML:
+        xpath = ET.XPath(path)
+
+        def find(elem):
+            hits = xpath(elem)
+            return hits[0] if hits else None
+
+        return find
+    return lambda elem: elem.find(path)
+
+
+# Rotor child tags and nested paths, spelled once
+_T_NAME = "旋翼名称"
+_T_CENTER = "中心点坐标"
+_T_RPY = "姿态角"
+_T_BCNT = "桨叶片数"
+_T_RPM = "转速"
+_T_DIR = "旋翼旋向"
+_T_SHAPE = "形状系数"
+_T_AERO_START = "翼型起始位置"
+_T_AERO_DATA = "气动数据"
+_P_AERO = "桨叶剖面/气动剖面/"
+_P_STRUCT = "桨叶剖面/结构剖面/"
+
+# Nested per-rotor lookups, compiled once for every rotor of every file
+_FIND_DIRECTION = _compile_find(_P_AERO + _T_DIR)
+_FIND_SHAPE = _compile_find(_P_STRUCT + _T_SHAPE)
+_FIND_AERO_START = _compile_find(_P_AERO + _T_AERO_START)
+_FIND_AERO_DATA = _compile_find(_P_AERO + _T_AERO_DATA)
+
+
+def _first_children(node: Any) -> Dict[str, Any]:
+    """First child of *node* per tag, i.e. what ``node.find(tag)`` returns, from one pass."""
+    first: Dict[str, Any] = {}
+    for child in node:
+        first.setdefault(child.tag, child)
+    return first
+
+
+def _iter_rotor_nodes(xml_bytes: bytes) -> Iterator[Any]:
+    """Yield the children of the root element (one per rotor) as each is parsed.
+
+    Every rotor element is cleared once the caller moves on, so only one rotor subtree
+    is held at a time. *xml_bytes* is UTF-8 whatever the XML declaration claims.
+    """
+    source = io.BytesIO(xml_bytes)
+    if _HAS_LXML:
+        events = ET.iterparse(
+            source, events=("start", "end"), encoding="utf-8", remove_comments=True, remove_pis=True
+        )
+    else:
+        events = ET.iterparse(source, events=("start", "end"), parser=ET.XMLParser(encoding="utf-8"))
+    depth = 0
+    for event, elem in events:
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth == 1:
+            yield elem
+            elem.clear()
+            if _HAS_LXML:
+                # Also drop the emptied rotor elements kept as earlier siblings
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+
 def parse_rotors_xml(xml_path: str) -> List[RotorCfg]:
     """Parse the multi-rotor description XML."""
     if not os.path.isfile(xml_path):
         raise FileNotFoundError(f"Rotors XML not found: {xml_path}")
 
     with open(xml_path, "r", encoding="utf-8", errors="ignore") as fh:
-        xml_text = _fix_malformed_tags(fh.read())
+        xml_bytes = _fix_malformed_tags(fh.read()).encode("utf-8")
+
+    rotors: List[RotorCfg] = []
+    xml_dir = os.path.dirname(os.path.abspath(xml_path))
+    # Rotors commonly share one .tip file: resolve (and stat) each distinct raw path once
+    resolved: Dict[Optional[str], Optional[str]] = {}
 
     try:
-        root = ET.fromstring(xml_text)
-    except ET.ParseError as exc:
+        for idx, rotor_node in enumerate(_iter_rotor_nodes(xml_bytes), start=1):
+            rotors.append(_rotor_cfg(idx, rotor_node, xml_path, xml_dir, resolved))
+    except _XML_ERRORS as exc:
         raise ValueError(
             f"Failed to parse rotors XML '{xml_path}'. Ensure the file is a valid XML document."
         ) from exc
-    rotors: List[RotorCfg] = []
 
-    for idx, rotor_node in enumerate(list(root), start=1):
-        name = _get_text(rotor_node.find("旋翼名称")) or f"rotor_{idx}"
-        center = _to_floats_csv(_get_text(rotor_node.find("中心点坐标")))
-        rpy = _to_floats_csv(_get_text(rotor_node.find("姿态角")))
-
-        try:
-            blade_count = int(float(_get_text(rotor_node.find("桨叶片数"))))
-        except Exception:
-            blade_count = 2
-        try:
-            rpm = float(_get_text(rotor_node.find("转速")))
-        except Exception:
-            rpm = 0.0
-
-        direction = (
-            _get_text(rotor_node.find("桨叶剖面/气动剖面/旋翼旋向"))
-            or _get_text(rotor_node.find("旋翼旋向"))
-            or "逆时针"
-        )
+    return rotors
 
-        shape_path_raw = (
-            _get_text(rotor_node.find("桨叶剖面/结构剖面/形状系数"))
-            or _get_text(rotor_node.find("形状系数"))
-            or None
-        )
-        shape_path = _resolve_tip_path(xml_path, shape_path_raw)
-
-        aero_start_node = rotor_node.find("桨叶剖面/气动剖面/翼型起始位置")
-        aero_data_node = rotor_node.find("桨叶剖面/气动剖面/气动数据")
-        aero_start_text = _get_text(aero_start_node) if aero_start_node is not None else ""
-        aero_start = _to_floats_csv(aero_start_text) if aero_start_text else None
-        aero_block = _get_text(aero_data_node) if aero_data_node is not None else None
-
-        rotors.append(
-            RotorCfg(
-                index=idx,
-                name=name,
-                center_xyz=center,
-                attitude_rpy=rpy,
-                blade_count=blade_count,
-                rpm=rpm,
-                direction=direction,
-                shape_tip_path=shape_path,
-                aero_start_xyz=aero_start,
-                aero_data_block=aero_block,
-            )
-        )
 
-    return rotors
+def _rotor_cfg(
+    idx: int,
+    rotor_node: Any,
+    xml_path: str,
+    xml_dir: str,
+    resolved: Dict[Optional[str], Optional[str]],
+) -> RotorCfg:
+    """Build the RotorCfg of one rotor element; *resolved* memoises tip path resolution."""
+    kids = _first_children(rotor_node)
+    name = _get_text(kids.get(_T_NAME)) or f"rotor_{idx}"
+    center = _to_floats_csv(_get_text(kids.get(_T_CENTER)))
+    rpy = _to_floats_csv(_get_text(kids.get(_T_RPY)))
+
+    try:
+        blade_count = int(float(_get_text(kids.get(_T_BCNT))))
+    except Exception:
+        blade_count = 2
+    try:
+        rpm = float(_get_text(kids.get(_T_RPM)))
+    except Exception:
+        rpm = 0.0
+
+    direction = (
+        _get_text(_FIND_DIRECTION(rotor_node))
+        or _get_text(kids.get(_T_DIR))
+        or "逆时针"
+    )
+
+    shape_path_raw = (
+        _get_text(_FIND_SHAPE(rotor_node))
+        or _get_text(kids.get(_T_SHAPE))
+        or None
+    )
+    if shape_path_raw in resolved:
+        shape_path = resolved[shape_path_raw]
+    else:
+        shape_path = resolved[shape_path_raw] = _resolve_tip_path(xml_path, shape_path_raw, xml_dir)
+
+    aero_start_node = _FIND_AERO_START(rotor_node)
+    aero_data_node = _FIND_AERO_DATA(rotor_node)
+    aero_start_text = _get_text(aero_start_node) if aero_start_node is not None else ""
+    aero_start = _to_floats_csv(aero_start_text) if aero_start_text else None
+    aero_block = _get_text(aero_data_node) if aero_data_node is not None else None
+
+    return RotorCfg(
+        index=idx,
+        name=name,
+        center_xyz=center,
+        attitude_rpy=rpy,
+        blade_count=blade_count,
+        rpm=rpm,
+        direction=direction,
+        shape_tip_path=shape_path,
+        aero_start_xyz=aero_start,
+        aero_data_block=aero_block,
+    )
 
 
 def parse_vehicle_xml(xml_path: str) -> VehicleCfg:
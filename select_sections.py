@@ -13,9 +13,8 @@ Definitions:
 - K control sections -> (K-1) elements -> (2K-1) nodes (end-mid-end pattern)
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List, Tuple, Dict, Optional
-import math
 import numpy as np
 
 from io_blade import TipData, AeroData
@@ -41,40 +40,38 @@ class SectionReport:
     nodes: int
     warnings: List[str]
     notes: List[str]
+    # reasons of every selected section pre-joined for the report ("START, JUMP:EA")
+    reasons_text: Dict[float, str] = field(default_factory=dict)
 
 
 # ───────────────────────── helpers ─────────────────────────
 
 _EPS = 1e-12
 
-def _interp1(x: np.ndarray, y: np.ndarray, xi: float) -> float:
-    """Linear interpolation with clamping to [min(x), max(x)]."""
+def _interp1(x: np.ndarray, y: np.ndarray, xi: np.ndarray) -> np.ndarray:
+    """Element-wise linear interpolation with clamping to [x[0], x[-1]].
+
+    A 2D *y* holds one signal per row; the result then gains a leading signal axis.
+    """
+    if y.ndim > 1:
+        return np.stack([_interp1(x, row, xi) for row in y])
     if len(x) == 0:
-        return 0.0
-    if xi <= x[0]:
-        return float(y[0])
-    if xi >= x[-1]:
-        return float(y[-1])
-    return float(np.interp(xi, x, y))
+        return np.zeros_like(xi)
+    yi = np.interp(xi, x, y)
+    # np.interp already clamps to y[0]/y[-1] outside the stations and returns y[-1] at
+    # x[-1]; only at a duplicated first station would it pick the last duplicate's value
+    if len(x) > 1 and x[1] == x[0]:
+        yi = np.where(xi <= x[0], y[0], yi)
+    return yi
 
 def _add_reason(reasons: Dict[float, List[str]], r: float, why: str):
-    reasons.setdefault(r, [])
-    if why not in reasons[r]:
-        reasons[r].append(why)
-
-def _is_protected(reasons: Dict[float, List[str]], r: float) -> bool:
-    """Hard constraints we try not to merge away."""
-    tags = reasons.get(r, [])
-    for t in tags:
-        if t.startswith("START") or t.startswith("END") or t.startswith("JUMP") or t.startswith("VERTEX"):
-            return True
-    return False
-
-def _auto_r_start_from_aero(aero: Optional[AeroData], c_eps: float, rmin: float, rmax: float) -> Optional[float]:
-    if aero is None or not aero.Chord:
-        return None
-    r = np.asarray(aero.Radial, dtype=float)
-    c = np.asarray(aero.Chord, dtype=float)
+    # Insertion order is the report order; a section carries only a handful of tags
+    tags = reasons.setdefault(r, [])
+    if why not in tags:
+        tags.append(why)
+
+def _auto_r_start_from_aero(r: np.ndarray, c: np.ndarray, c_eps: float, rmin: float, rmax: float) -> Optional[float]:
+    """First radial station of chord c(r) above c_eps, clamped to [rmin, rmax); None if none."""
     if np.all(~np.isfinite(c)) or np.all(np.abs(c) <= 0):
         return None
     idx = np.where(c > c_eps)[0]
@@ -84,73 +81,71 @@ def _auto_r_start_from_aero(aero: Optional[AeroData], c_eps: float, rmin: float,
     # clamp to [rmin, rmax)
     return max(rmin, min(r0, max(rmin, rmax - _EPS)))
 
-def _auto_r_start_from_struct(tip: TipData) -> float:
-    r = np.asarray(tip.STA, dtype=float)
-    EA  = np.asarray(tip.EA, dtype=float)
-    EJY = np.asarray(tip.EJY, dtype=float)
-    EJZ = np.asarray(tip.EJZ, dtype=float)
-    GJ  = np.asarray(tip.GJ, dtype=float)
+def _auto_r_start_from_struct(r: np.ndarray, vals: np.ndarray) -> float:
+    """First station r where any row of the (4, N) EA/EJY/EJZ/GJ matrix *vals* is non-zero-ish."""
     # Use relative threshold vs global max to avoid noise at root
-    mags = np.vstack([np.abs(EA), np.abs(EJY), np.abs(EJZ), np.abs(GJ)])
-    maxv = np.max(mags)
+    maxv = np.max(np.abs(vals))
     thr = 1e-6 * max(1.0, maxv)  # permissive
-    for i in range(len(r)):
-        if EA[i] > thr or EJY[i] > thr or EJZ[i] > thr or GJ[i] > thr:
-            return float(r[i])
-    return float(r[0])
+    # First station where any signal exceeds thr, else the root
+    hit = (vals > thr).any(axis=0)
+    i = int(np.argmax(hit))
+    return float(r[i]) if hit[i] else float(r[0])
+
+def _jump_mask(x: np.ndarray, y: np.ndarray, r_start: float, jump_tol: float) -> np.ndarray:
+    """Mask over x[1:] of the stations where *y* (or each row of a 2D *y*) jumps by >= jump_tol."""
+    y0, y1 = y[..., :-1], y[..., 1:]
+    base = np.maximum(np.maximum(np.abs(y0), np.abs(y1)), _EPS)
+    with np.errstate(invalid="ignore"):
+        rel = np.abs(y1 - y0) / base
+    # ~(x < r_start) rather than x >= r_start: a NaN station is not skipped
+    return (rel >= jump_tol) & ~(x[1:] < r_start)
 
 def _detect_jumps(x: np.ndarray, y: np.ndarray, r_start: float, jump_tol: float) -> List[float]:
     """Return x positions (from original samples) where relative jump exceeds threshold."""
-    rs = []
-    for i in range(1, len(x)):
-        if x[i] < r_start:
-            continue
-        y0, y1 = y[i-1], y[i]
-        base = max(abs(y0), abs(y1), _EPS)
-        rel = abs(y1 - y0) / base
-        if rel >= jump_tol:
-            rs.append(float(x[i]))
-    return rs
-
-def _detect_chord_vertices(aero: Optional[AeroData], r_start: float) -> List[float]:
+    return x[1:][_jump_mask(x, y, r_start, jump_tol)].tolist()
+
+def _detect_chord_vertices(r: np.ndarray, c: np.ndarray, r_start: float) -> List[float]:
     """
-    Detect local extrema of chord to capture planform vertices.
+    Detect local extrema of chord c(r) to capture planform vertices.
     Simple criterion: (c[i]-c[i-1])*(c[i+1]-c[i]) <= 0 and
       max(|ΔL|,|ΔR|) > δ, where δ = 1e-3 * max(chord).
     """
-    if aero is None or not aero.Chord or len(aero.Radial) < 3:
+    if len(r) < 3:
         return []
-    r = np.asarray(aero.Radial, dtype=float)
-    c = np.asarray(aero.Chord, dtype=float)
     if np.max(np.abs(c)) <= 0:
         return []
     delta_thr = 1e-3 * float(np.max(np.abs(c)))
-    out = []
-    for i in range(1, len(r)-1):
-        if r[i] < r_start:
-            continue
-        dL = c[i] - c[i-1]
-        dR = c[i+1] - c[i]
-        if dL * dR <= 0 and max(abs(dL), abs(dR)) > delta_thr:
-            out.append(float(r[i]))
-    return out
-
-def _mid_error(x: np.ndarray, y: np.ndarray, a: float, b: float) -> float:
-    """Relative midpoint error of linear interpolation vs true value."""
-    if b <= a + _EPS:
-        return 0.0
+    d = np.diff(c)
+    dL, dR = d[:-1], d[1:]  # slopes left and right of every interior station
+    hit = (dL * dR <= 0) & (np.maximum(np.abs(dL), np.abs(dR)) > delta_thr) & ~(r[1:-1] < r_start)
+    return r[1:-1][hit].tolist()
+
+def _mid_errors(x: np.ndarray, y: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Relative midpoint error of linear interpolation vs true value on every segment [a, b].
+
+    A 2D *y* gives one row of errors per signal row.
+    """
     rm = 0.5*(a+b)
-    ya = _interp1(x, y, a)
-    yb = _interp1(x, y, b)
-    ym = _interp1(x, y, rm)
-    ylin = ya + (yb - ya) * (rm - a) / (b - a)
-    denom = max(abs(ym), abs(ya), abs(yb), _EPS)
-    return abs(ym - ylin) / denom
+    # Both ends and the midpoint of every segment in one interpolation call
+    ya, yb, ym = np.moveaxis(_interp1(x, y, np.stack([a, b, rm])), -2, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ylin = ya + (yb - ya) * (rm - a) / (b - a)
+    denom = np.maximum(np.maximum(np.abs(ym), np.abs(ya)), np.maximum(np.abs(yb), _EPS))
+    return np.where(b <= a + _EPS, 0.0, np.abs(ym - ylin) / denom)
 
 def _ensure_sorted_unique(vals: List[float]) -> List[float]:
-    arr = np.array(sorted(vals), dtype=float)
+    return _dedupe_sorted(np.array(sorted(vals), dtype=float))
+
+def _dedupe_sorted(arr: np.ndarray) -> List[float]:
+    """_ensure_sorted_unique() of an array already in order, e.g. points spliced into their segments."""
     if len(arr) == 0:
         return []
+    # Usual case: every neighbour already more than 1e-12 apart, nothing to drop
+    if (np.diff(arr) > 1e-12).all():
+        return arr.tolist()
+    # Re-sort in case a spliced point rounded past its segment end (a no-op otherwise),
+    # then compare each value against the last one kept, not its neighbour
+    arr = np.array(sorted(arr.tolist()), dtype=float)
     uniq = [arr[0]]
     for v in arr[1:]:
         if v - uniq[-1] > 1e-12:
@@ -182,6 +177,9 @@ def auto_select_sections(tip: TipData,
        For each segment [ri, rj], compute midpoint error for signals in
        S = {Chord (if aero), EA, EJY, EJZ, GJ}.
        If any eps_f > err_tol, insert rm as new control section.
+       Every segment over tolerance is split in the same pass (one batched
+       evaluation per pass), so the result does not depend on visiting order;
+       the pass that reaches max_elems is applied whole and trimmed later.
 
     4) Size constraints:
        - Enforce max_dr by subdividing too-long segments (equal partition).
@@ -193,11 +191,22 @@ def auto_select_sections(tip: TipData,
     r_tip = np.asarray(tip.STA, dtype=float)
     rmin, rmax = float(r_tip[0]), float(r_tip[-1])
 
+    # Signals on native grids, converted once for every step below.
+    # Structural, (4, N): one row per signal
+    struct = np.vstack([np.asarray(v, dtype=float) for v in (tip.EA, tip.EJY, tip.EJZ, tip.GJ)])
+    struct_codes = ("EA", "EJY", "EJZ", "GJ")
+    # Chord (if aero)
+    has_chord = aero is not None and bool(aero.Chord)
+    if has_chord:
+        r_a = np.asarray(aero.Radial, dtype=float)
+        c_a = np.asarray(aero.Chord, dtype=float)
+
     # 1) r_start
     if cfg.r_start is not None:
         r0 = float(cfg.r_start)
     else:
-        r0 = _auto_r_start_from_aero(aero, cfg.c_eps, rmin, rmax) or _auto_r_start_from_struct(tip)
+        r0 = ((_auto_r_start_from_aero(r_a, c_a, cfg.c_eps, rmin, rmax) if has_chord else None)
+              or _auto_r_start_from_struct(r_tip, struct))
     # clamp
     if r0 < rmin: r0 = rmin
     if r0 >= rmax: r0 = max(rmin, rmax - _EPS)
@@ -208,27 +217,17 @@ def auto_select_sections(tip: TipData,
     _add_reason(reasons, r0, "START")
     _add_reason(reasons, rmax, "END")
 
-    # Signals on native grids
-    # Structural
-    EA  = np.asarray(tip.EA, dtype=float)
-    EJY = np.asarray(tip.EJY, dtype=float)
-    EJZ = np.asarray(tip.EJZ, dtype=float)
-    GJ  = np.asarray(tip.GJ, dtype=float)
-
-    # Jumps on structural stations
-    for name, vec in (("EA", EA), ("EJY", EJY), ("EJZ", EJZ), ("GJ", GJ)):
-        js = _detect_jumps(r_tip, vec, r0, cfg.jump_tol)
-        for rr in js:
+    # Jumps on structural stations, all signals in one mask
+    for name, hit in zip(struct_codes, _jump_mask(r_tip, struct, r0, cfg.jump_tol)):
+        for rr in r_tip[1:][hit].tolist():
             if rr >= r0 and rr <= rmax:
                 sections.append(rr)
                 _add_reason(reasons, rr, f"JUMP:{name}")
 
     # Chord jumps & vertices (if aero)
-    if aero is not None and aero.Chord:
-        r_a = np.asarray(aero.Radial, dtype=float)
-        c_a = np.asarray(aero.Chord, dtype=float)
+    if has_chord:
         js_c = _detect_jumps(r_a, c_a, r0, cfg.jump_tol)
-        vs_c = _detect_chord_vertices(aero, r0)
+        vs_c = _detect_chord_vertices(r_a, c_a, r0)
         for rr in js_c:
             if rr >= r0 and rr <= rmax:
                 sections.append(rr)
@@ -238,6 +237,10 @@ def auto_select_sections(tip: TipData,
                 sections.append(rr)
                 _add_reason(reasons, rr, "VERTEX:Chord")
 
+    # Hard constraints we try not to merge away: so far every reason is START/END/JUMP/VERTEX,
+    # and later passes only add MAX_DR/ERR reasons or drop unprotected points
+    protected = frozenset(reasons)
+
     # Deduplicate base set
     sections = _ensure_sorted_unique(sections)
 
@@ -246,95 +249,90 @@ def auto_select_sections(tip: TipData,
         changed = True
         while changed:
             changed = False
-            new_pts: List[float] = []
-            for a, b in zip(sections[:-1], sections[1:]):
-                dr = b - a
-                if dr > cfg.max_dr + _EPS:
-                    n = int(math.ceil(dr / cfg.max_dr))
-                    for k in range(1, n):
-                        rp = a + dr * k / n
-                        new_pts.append(rp)
+            # Interior points a + dr*k/n, k = 1..n-1, of every too-long segment in one pass;
+            # one pass normally suffices, a second one only follows dedupe merging points
+            secs = np.asarray(sections, dtype=float)
+            drs = np.diff(secs)
+            long_idx = np.flatnonzero(drs > cfg.max_dr + _EPS)
+            n = np.ceil(drs[long_idx] / cfg.max_dr).astype(int)
+            seg = np.repeat(long_idx, n - 1)
+            k = np.arange(seg.size) - np.repeat(np.cumsum(n - 1) - (n - 1), n - 1) + 1
+            new_pts: List[float] = (secs[seg] + drs[seg] * k / np.repeat(n, n - 1)).tolist()
             if new_pts:
                 for rp in new_pts:
                     if rp not in reasons:
                         _add_reason(reasons, rp, "MAX_DR")
-                sections = _ensure_sorted_unique(sections + new_pts)
+                # Each segment's points are in order inside it: splice them in, no re-sort
+                sections = _dedupe_sorted(np.insert(secs, seg + 1, new_pts))
                 changed = True
             if len(sections) - 1 >= cfg.max_elems:
                 break
 
     # 3) Error-based refinement
-    def err_any(a: float, b: float) -> Tuple[float, float]:
-        """Return (max_err, err_from_which_signal_as_code)."""
-        errs = []
-        # structural signals on tip grid
-        for code, vec in (("EA", EA), ("EJY", EJY), ("EJZ", EJZ), ("GJ", GJ)):
-            e = _mid_error(r_tip, vec, a, b)
-            errs.append((e, code))
-        # chord if available
-        if aero is not None and aero.Chord:
-            r_a = np.asarray(aero.Radial, dtype=float)
-            c_a = np.asarray(aero.Chord, dtype=float)
-            errs.append((_mid_error(r_a, c_a, a, b), "Chord"))
-        # choose max
-        emax, code = max(errs, key=lambda t: t[0]) if errs else (0.0, "NA")
-        return emax, code
+    # Signal blocks checked per segment (structural rows on tip grid, chord if available)
+    signals = [(r_tip, struct)]
+    codes = list(struct_codes)
+    if has_chord:
+        signals.append((r_a, c_a[np.newaxis]))
+        codes.append("Chord")
+    why_by_signal = [f"ERR>{cfg.err_tol:.3f}:{code}" for code in codes]
 
     changed = True
     warnings: List[str] = []
     while changed and (len(sections) - 1) < cfg.max_elems:
         changed = False
-        new_pts: List[Tuple[float, str]] = []
-        for a, b in zip(sections[:-1], sections[1:]):
-            dr = b - a
-            # Respect min_dr: if already very small, don't split further
-            if cfg.min_dr is not None and dr <= cfg.min_dr + _EPS:
-                continue
-            emax, code = err_any(a, b)
-            if emax > cfg.err_tol:
-                rm = 0.5*(a+b)
-                new_pts.append((rm, f"ERR>{cfg.err_tol:.3f}:{code}"))
+        # One array per pass; segment starts/ends are views into it. All segments are
+        # re-evaluated: a pass costs a few NumPy calls whatever its size, so restricting it
+        # to the segments created last pass (marked-set bookkeeping) measured no faster
+        secs = np.asarray(sections, dtype=float)
+        a, b = secs[:-1], secs[1:]
+        # Max midpoint error over all signals per segment; argmax keeps the first signal on ties
+        errs = np.concatenate([_mid_errors(x, y, a, b) for x, y in signals])
+        which = np.argmax(errs, axis=0)
+        split = errs[which, np.arange(a.size)] > cfg.err_tol
+        # Respect min_dr: if already very small, don't split further
+        if cfg.min_dr is not None:
+            split &= ~(b - a <= cfg.min_dr + _EPS)
+        # Midpoints of the segments to split and the signal that triggered each, in one pass
+        new_pts = (0.5*(a+b))[split].tolist()
         if new_pts:
-            for rp, why in new_pts:
-                _add_reason(reasons, rp, why)
-            sections = _ensure_sorted_unique(sections + [rp for rp, _ in new_pts])
+            for rp, w in zip(new_pts, which[split].tolist()):
+                _add_reason(reasons, rp, why_by_signal[w])
+            # A midpoint lies inside its segment: splice each in after the segment start
+            sections = _dedupe_sorted(np.insert(secs, np.flatnonzero(split) + 1, new_pts))
             changed = True
         if len(sections) - 1 >= cfg.max_elems:
             break
 
-    # 4b) Enforce min_dr by merging removable interior points
-    if cfg.min_dr is not None and cfg.min_dr > 0:
-        changed = True
-        while changed:
-            changed = False
-            if len(sections) <= 2:
-                break
-            # compute drs
-            drs = [b - a for a, b in zip(sections[:-1], sections[1:])]
-            # if any very small segments exist, attempt merge by removing a non-protected interior point
-            for i in range(1, len(sections)-1):
-                left_dr = sections[i]   - sections[i-1]
-                right_dr= sections[i+1] - sections[i]
-                if min(left_dr, right_dr) < cfg.min_dr - _EPS and not _is_protected(reasons, sections[i]):
-                    # remove this interior point
-                    warnings.append(f"min_dr merge: removed section at r={sections[i]:.6f}")
-                    reasons.pop(sections[i], None)
-                    sections.pop(i)
-                    changed = True
-                    break  # restart scan
+    # 4b) Enforce min_dr by merging removable interior points.
+    # One left-to-right pass: dropping a point only lengthens its neighbours' segments, so
+    # no point already kept can become removable and a rescan from the start finds nothing new
+    if cfg.min_dr is not None and cfg.min_dr > 0 and len(sections) > 2:
+        thr = cfg.min_dr - _EPS
+        kept = [sections[0]]
+        for r, r_next in zip(sections[1:-1], sections[2:]):
+            if min(r - kept[-1], r_next - r) < thr and r not in protected:
+                warnings.append(f"min_dr merge: removed section at r={r:.6f}")
+                reasons.pop(r, None)
+            else:
+                kept.append(r)
+        kept.append(sections[-1])
+        sections = kept
 
     # Final dedupe & cap max_elems if necessary (drop newest interior points without hard tags)
     sections = _ensure_sorted_unique(sections)
-    while (len(sections) - 1) > cfg.max_elems:
-        # try to drop a non-protected interior section (closest to mid-span)
+    excess = len(sections) - 1 - cfg.max_elems
+    if excess > 0:
+        # Drop non-protected interior sections closest to mid-span first. The ends never move,
+        # so one sort gives the order in which dropping them one at a time would go
         mid = 0.5*(sections[0] + sections[-1])
-        candidates = [(abs(r - mid), idx, r) for idx, r in enumerate(sections[1:-1], start=1) if not _is_protected(reasons, r)]
-        if not candidates:
+        candidates = sorted((abs(r - mid), idx, r) for idx, r in enumerate(sections[1:-1], start=1) if r not in protected)
+        if len(candidates) < excess:
             warnings.append("max_elems limit reached but cannot drop protected sections.")
-            break
-        _, idx_drop, r_drop = sorted(candidates)[0]
-        reasons.pop(r_drop, None)
-        sections.pop(idx_drop)
+        drop = {idx for _, idx, _ in candidates[:excess]}
+        for _, _, r in candidates[:excess]:
+            reasons.pop(r, None)
+        sections = [r for idx, r in enumerate(sections) if idx not in drop]
 
     sections = _ensure_sorted_unique(sections)
     K = len(sections)
@@ -352,6 +350,7 @@ def auto_select_sections(tip: TipData,
             f"signals={'Chord+' if (aero and aero.Chord) else ''}EA,EJY,EJZ,GJ",
             f"err_tol={cfg.err_tol}, jump_tol={cfg.jump_tol}, max_elems={cfg.max_elems}, "
             f"max_dr={cfg.max_dr}, min_dr={cfg.min_dr}"
-        ]
+        ],
+        reasons_text={r: ", ".join(reasons.get(r, ())) for r in sections},
     )
     return sections, report
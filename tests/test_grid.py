@@ -25,5 +25,61 @@ def test_build_grid_structure_and_eval_points():
     for pair, expected in zip(grid.eval_points, expected_eval):
         assert pair == pytest.approx(expected)
 
+    assert grid.nodes_arr.tolist() == pytest.approx(grid.nodes)
+    assert grid.elem_x1.tolist() == pytest.approx([0.0, 0.5])
+    assert grid.elem_xm.tolist() == pytest.approx([0.25, 1.0])
+    assert grid.elem_x2.tolist() == pytest.approx([0.5, 1.5])
+
     assert grid.interp_tip is None
     assert grid.interp_aero is None
+
+
+def test_interp_aero_vec_matches_scalar():
+    from io_blade import AeroData
+    from grid import attach_interpolators
+
+    class _Tip:
+        STA = [0.0, 1.0]
+
+    for name in ("EA", "EJY", "EJZ", "GJ", "YNA", "ZNA", "YCT", "ZCT", "ROTAN_deg",
+                 "ROTAPI_deg", "dM", "dJX", "dJY", "dJZ", "YCG", "ZCG"):
+        setattr(_Tip, name, [0.0, 1.0])
+    aero = AeroData(Radial=[0.2, 0.6, 1.0], Chord=[0.5, 0.3, 0.4])
+    grid = attach_interpolators(build_grid([0.0, 0.5, 1.5]), _Tip(), aero)
+
+    xs = [-1.0, 0.2, 0.45, 0.6, 0.99, 2.0]
+    assert grid.interp_aero_vec("Chord", xs).tolist() == pytest.approx(
+        [grid.interp_aero("Chord", x) for x in xs]
+    )
+
+
+def test_scalar_interp_matches_np_interp_exactly():
+    np = pytest.importorskip("numpy")
+    from grid import _make_interp_closure
+
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        x = np.sort(rng.uniform(0.0, 4.0, 30))
+        x[10] = x[9]  # duplicate station (step in the data)
+        y = rng.normal(size=30) * 1.0e6
+        interp = _make_interp_closure(x, {"f": y})
+        xq = np.concatenate([rng.uniform(-1.0, 5.0, 300), x])
+        assert [interp("f", q) for q in xq.tolist()] == np.interp(xq, x, y).tolist()
+
+
+def test_interp_many_matches_np_interp_exactly():
+    np = pytest.importorskip("numpy")
+    from grid import _make_interp_many_closure
+
+    rng = np.random.default_rng(1)
+    x = np.sort(rng.uniform(0.0, 4.0, 30))
+    x[1] = x[0]  # duplicate first station
+    fields = {k: rng.normal(size=30) * 1.0e5 for k in ("a", "b", "c")}
+    interp_many = _make_interp_many_closure(x, fields)
+    xq = np.concatenate([rng.uniform(-1.0, 5.0, 300), x])
+    out = interp_many(("c", "a"), xq)
+    assert out.shape == (2, xq.size)
+    assert out[0].tolist() == np.interp(xq, x, fields["c"]).tolist()
+    assert out[1].tolist() == np.interp(xq, x, fields["a"]).tolist()
+    with pytest.raises(KeyError):
+        interp_many(("nope",), xq)
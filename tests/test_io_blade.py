@@ -22,3 +22,46 @@ def test_load_aero_single_column_error(tmp_path):
         load_aero(str(aero_path))
 
     assert "could not infer Radial/Chord columns" in str(excinfo.value)
+
+
+def test_load_tip_builds_field_table(tmp_path):
+    from io_blade import TIP_FIELDS, load_tip
+
+    header = "SEC STA WEIGHT XCG ZCG ROTAPI JX JZ JP EA XNA ZNA ROTAN EJZ EJX GJ XCT ZCT"
+    units = "- m kg/m m m deg kgm kgm kgm N m m deg Nm2 Nm2 Nm2 m m"
+    rows = [
+        "2 1.0 " + " ".join(str(float(v)) for v in range(2, 18)),
+        "1 0.5 " + " ".join(str(float(v) + 0.5) for v in range(2, 18)),
+    ]
+    tip_path = tmp_path / "demo.tip"
+    tip_path.write_text(
+        "\n".join(["BLADE STRUCT Y", "TABLE", header, units, *rows, "ENDTABLE"]) + "\n",
+        encoding="utf-8",
+    )
+
+    tip = load_tip(str(tip_path))
+    assert tip.table.shape == (len(TIP_FIELDS), 2)
+    assert tip.STA.tolist() == [0.5, 1.0]
+    assert tip.dM.tolist() == [2.5, 2.0]
+    assert tip.YCG.tolist() == [4.5, 4.0]  # YCG <- ZCG
+    assert tip.EJY.tolist() == [14.5, 14.0]  # EJY <- EJX
+    for i, name in enumerate(TIP_FIELDS):
+        assert getattr(tip, name).base is tip.table
+        assert getattr(tip, name).tolist() == tip.table[i].tolist()
+
+
+def test_load_aero_reparses_only_when_file_changes(tmp_path):
+    import os
+
+    aero_path = tmp_path / "aero.dat"
+    aero_path.write_text("Radial Chord\n0.1 0.5\n0.9 0.3\n", encoding="utf-8")
+    first = load_aero(str(aero_path))
+    second = load_aero(str(aero_path))
+    assert second == first and second is not first
+    second.Chord[0] = -1.0
+    assert load_aero(str(aero_path)).Chord[0] == 0.5
+
+    aero_path.write_text("Radial Chord\n0.1 0.6\n0.9 0.3\n1.0 0.2\n", encoding="utf-8")
+    st = os.stat(aero_path)
+    os.utime(aero_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert load_aero(str(aero_path)).Chord == [0.6, 0.3, 0.2]
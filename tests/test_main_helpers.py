@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+
+def test_sanitize_name_replaces_each_unsafe_char():
+    pytest.importorskip("numpy")
+    from main import _sanitize_name
+
+    assert _sanitize_name("rotor 1/left", "fb") == "rotor_1_left"
+    assert _sanitize_name("a  b", "fb") == "a__b"
+    assert _sanitize_name("旋翼1", "fb") == "旋翼1"
+    assert _sanitize_name("-x_", "fb") == "-x"
+    assert _sanitize_name(" ./ ", "fb") == "fb"
+
+
+def test_y_sign_from_direction():
+    pytest.importorskip("numpy")
+    from main import _y_sign_from_direction
+
+    for cw in ("CW", " cw ", "顺时针", "顺时针方向"):
+        assert _y_sign_from_direction(cw) == -1.0
+    for ccw in ("ccw", "逆时针", "", None, "clockwise"):
+        assert _y_sign_from_direction(ccw) == 1.0
+
+
+def test_main_writes_main_mbd_for_sample_rotors(tmp_path: Path):
+    pytest.importorskip("numpy")
+    from main import main as run_main
+
+    rotors_xml = Path(__file__).resolve().parents[1] / "act_rotor.xml"
+    out_dir = tmp_path / "out"
+
+    assert run_main(["--rotors-xml", str(rotors_xml), "--out", str(out_dir)]) == 0
+    assert (out_dir / "main.mbd").is_file()
@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-pytest.importorskip("numpy")
+np = pytest.importorskip("numpy")
 
 from gcs import write_gcs_refs
 from rotors_xml import parse_rotors_xml, RotorCfg
@@ -94,9 +94,13 @@ class DummyTip:
 
 class DummyGrid:
     def __init__(self):
-        self.nodes = [0.0]
+        self.nodes = [0.0, 0.5, 1.0]
         self.elements = [(0.0, 0.5, 1.0)]
         self.eval_points = [(0.25, 0.75)]
+        self.nodes_arr = np.array(self.nodes)
+        self.elem_x1 = np.array([0.0])
+        self.elem_xm = np.array([0.5])
+        self.elem_x2 = np.array([1.0])
 
         data = {
             "ROTAPI_deg": 0.0,
@@ -116,7 +120,11 @@ class DummyGrid:
         def interp(field: str, _x: float) -> float:
             return data[field]
 
+        def interp_many(fields, xs):
+            return np.array([np.full(len(xs), data[f]) for f in fields])
+
         self.interp_tip = interp
+        self.interp_tip_many = interp_many
         self.interp_aero = None
 
 